@@ -0,0 +1,83 @@
+from kivy.uix.screenmanager import Screen
+from kivy.uix.button import Button
+from kivy.app import App
+from kivy.graphics import Color, Rectangle
+from app.utils.themes import theme_manager
+from app.utils.dispatcher import REPEATABLE_KEYS
+from app.utils.health import DEGRADED, LOST
+from app.utils.perf import perf
+from app.widgets.repeat_button import RepeatButton
+
+class RemoteScreen(Screen):
+    """Base das telas de controle (retrato e paisagem)."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._built = False
+        self._key_buttons = {}  # tecla -> botões que a enviam
+        # Fundo criado uma vez; tema e tamanho só atualizam as instruções
+        with self.canvas.before:
+            self.bg = Color(*theme_manager.bg_color)
+            self.rect = Rectangle(pos=self.pos, size=self.size)
+        theme_manager.bind_widget(self.bg, rgba='bg_color')
+        self.bind(pos=self._update_rect, size=self._update_rect)
+
+    def on_pre_enter(self):
+        self.ensure_built()
+
+    def ensure_built(self):
+        # Os widgets são montados só na primeira vez; girar a tela apenas troca de Screen
+        if not self._built:
+            self._built = True
+            app = App.get_running_app()
+            with perf.timer("ui.build." + self.name):
+                self.build_ui()
+            app.bind(supported_keys=self._update_supported_keys)
+            self._update_supported_keys(app, app.supported_keys)
+
+    def build_ui(self):
+        raise NotImplementedError
+
+    def _update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
+
+    def _bind_tv_labels(self, app, name_label, ip_label, status_label=None):
+        app.bind(tv_name=name_label.setter('text'))
+        if status_label is not None:
+            # Volume/mudo/fonte vêm do estado guardado no app, nunca direto da TV
+            status_label.text = app.tv_status
+            app.bind(tv_status=status_label.setter('text'))
+        update_ip = lambda *args: setattr(ip_label, 'text', self._connection_text(app.tv_ip, app.tv_state))
+        app.bind(tv_ip=update_ip, tv_state=update_ip)
+        update_ip()
+
+    @staticmethod
+    def _connection_text(ip, state):
+        if not ip:
+            return "BUSCAR TV"
+        if state == DEGRADED:
+            return f"{ip} (INSTÁVEL)"
+        if state == LOST:
+            return f"{ip} (SEM RESPOSTA)"
+        return ip
+
+    def key_button(self, cmd, **kwargs):
+        """
+        Botão que envia a tecla `cmd`; fica desabilitado se a TV não a suportar.
+        Volume, canal e cursor repetem enquanto o botão estiver pressionado.
+        """
+        if cmd in REPEATABLE_KEYS:
+            btn = RepeatButton(**kwargs)
+            btn.bind(on_repeat=lambda x: App.get_running_app().send_repeat(cmd))
+        else:
+            btn = Button(**kwargs)
+        btn.bind(on_press=lambda x: App.get_running_app().send_command(cmd))
+        self._key_buttons.setdefault(cmd, []).append(btn)
+        return btn
+
+    def _update_supported_keys(self, app, keys):
+        # Lista vazia = capacidades ainda desconhecidas: tudo habilitado
+        for cmd, buttons in self._key_buttons.items():
+            for btn in buttons:
+                btn.disabled = bool(keys) and cmd not in keys
@@ -1,32 +1,19 @@
-from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 from kivy.uix.button import Button
 from kivy.metrics import dp
 from kivy.app import App
-from kivy.graphics import Color, Rectangle
 from app.utils.themes import theme_manager
+from app.screens.remote_base import RemoteScreen
 
-class RemotePortraitScreen(Screen):
+class RemotePortraitScreen(RemoteScreen):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = 'remote_portrait'
-        theme_manager.bind(bg_color=self._update_ui)
-
-    def on_enter(self):
-        self.build_ui()
-
-    def _update_ui(self, *args):
-        if self.parent: self.build_ui()
 
     def build_ui(self):
-        self.clear_widgets()
         app = App.get_running_app()
-        
-        with self.canvas.before:
-            Color(*theme_manager.bg_color)
-            self.rect = Rectangle(pos=self.pos, size=self.size)
 
         main_layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
         
@@ -34,16 +21,20 @@ class RemotePortraitScreen(Screen):
         top_bar = BoxLayout(size_hint_y=None, height=dp(70), spacing=dp(10))
         
         # Display de IP (Clicável para renomear)
-        display_btn = Button(background_color=theme_manager.display_bg, size_hint_x=0.8)
+        display_btn = theme_manager.bind_widget(Button(size_hint_x=0.8), background_color='display_bg')
         display_btn.bind(on_press=lambda x: app.show_rename_popup())
         display_content = BoxLayout(orientation='vertical', padding=dp(5))
-        display_content.add_widget(Label(text=app.tv_name, bold=True, color=theme_manager.display_text, font_size='16sp'))
-        display_content.add_widget(Label(text=app.tv_ip if app.tv_ip else "BUSCAR TV", color=theme_manager.display_text, font_size='12sp'))
+        name_label = theme_manager.bind_widget(Label(text=app.tv_name, bold=True, font_size='16sp'), color='display_text')
+        ip_label = theme_manager.bind_widget(Label(text=app.tv_ip if app.tv_ip else "BUSCAR TV", font_size='12sp'), color='display_text')
+        status_label = theme_manager.bind_widget(Label(font_size='11sp'), color='display_text')
+        self._bind_tv_labels(app, name_label, ip_label, status_label)
+        display_content.add_widget(name_label)
+        display_content.add_widget(ip_label)
+        display_content.add_widget(status_label)
         display_btn.add_widget(display_content)
         top_bar.add_widget(display_btn)
         
-        pwr_btn = Button(text='OFF', size_hint_x=0.2, background_color=theme_manager.accent_color, bold=True)
-        pwr_btn.bind(on_press=lambda x: app.send_command("Standby"))
+        pwr_btn = theme_manager.bind_widget(self.key_button("Standby", text='OFF', size_hint_x=0.2, bold=True), background_color='accent_color')
         top_bar.add_widget(pwr_btn)
         main_layout.add_widget(top_bar)
 
@@ -59,19 +50,19 @@ class RemotePortraitScreen(Screen):
         }
         
         # Linha 1
-        nav_layout.add_widget(Button(text="VOLTAR", background_color=[0.4, 0.4, 0.4, 1], on_press=lambda x: app.send_command("Back")))
-        nav_layout.add_widget(Button(text=arrows["UP"], font_size='20sp', bold=True, on_press=lambda x: app.send_command("CursorUp")))
-        nav_layout.add_widget(Button(text="HOME", background_color=theme_manager.primary_color, bold=True, on_press=lambda x: app.send_command("Home")))
+        nav_layout.add_widget(self.key_button("Back", text="VOLTAR", background_color=[0.4, 0.4, 0.4, 1]))
+        nav_layout.add_widget(self.key_button("CursorUp", text=arrows["UP"], font_size='20sp', bold=True))
+        nav_layout.add_widget(theme_manager.bind_widget(self.key_button("Home", text="HOME", bold=True), background_color='primary_color'))
         
         # Linha 2
-        nav_layout.add_widget(Button(text=arrows["LEFT"], font_size='20sp', bold=True, on_press=lambda x: app.send_command("CursorLeft")))
-        nav_layout.add_widget(Button(text="OK", font_size='24sp', bold=True, background_color=theme_manager.primary_color, on_press=lambda x: app.send_command("Confirm")))
-        nav_layout.add_widget(Button(text=arrows["RIGHT"], font_size='20sp', bold=True, on_press=lambda x: app.send_command("CursorRight")))
+        nav_layout.add_widget(self.key_button("CursorLeft", text=arrows["LEFT"], font_size='20sp', bold=True))
+        nav_layout.add_widget(theme_manager.bind_widget(self.key_button("Confirm", text="OK", font_size='24sp', bold=True), background_color='primary_color'))
+        nav_layout.add_widget(self.key_button("CursorRight", text=arrows["RIGHT"], font_size='20sp', bold=True))
         
         # Linha 3
-        nav_layout.add_widget(Button(text="MENU", on_press=lambda x: app.send_command("Menu")))
-        nav_layout.add_widget(Button(text=arrows["DOWN"], font_size='20sp', bold=True, on_press=lambda x: app.send_command("CursorDown")))
-        nav_layout.add_widget(Button(text="INFO", on_press=lambda x: app.send_command("Info")))
+        nav_layout.add_widget(self.key_button("Menu", text="MENU"))
+        nav_layout.add_widget(self.key_button("CursorDown", text=arrows["DOWN"], font_size='20sp', bold=True))
+        nav_layout.add_widget(self.key_button("Info", text="INFO"))
         
         main_layout.add_widget(nav_layout)
 
@@ -80,10 +71,8 @@ class RemotePortraitScreen(Screen):
         
         # Canais (Esquerda)
         chan_box = BoxLayout(orientation='vertical', spacing=dp(5))
-        chan_up = Button(text="CH +", font_size='20sp', bold=True)
-        chan_up.bind(on_press=lambda x: app.send_command("ChannelUp"))
-        chan_down = Button(text="CH -", font_size='20sp', bold=True)
-        chan_down.bind(on_press=lambda x: app.send_command("ChannelDown"))
+        chan_up = self.key_button("ChannelUp", text="CH +", font_size='20sp', bold=True)
+        chan_down = self.key_button("ChannelDown", text="CH -", font_size='20sp', bold=True)
         chan_box.add_widget(chan_up)
         chan_box.add_widget(chan_down)
         control_layout.add_widget(chan_box)
@@ -91,10 +80,9 @@ class RemotePortraitScreen(Screen):
         # Botões de Utilidade (Centro)
         util_box = BoxLayout(orientation='vertical', spacing=dp(5), size_hint_x=0.6)
         
-        mute_btn = Button(text="MUTE", background_color=[0.5, 0.5, 0.5, 1])
-        mute_btn.bind(on_press=lambda x: app.send_command("Mute"))
+        mute_btn = self.key_button("Mute", text="MUTE", background_color=[0.5, 0.5, 0.5, 1])
         
-        key_btn = Button(text="TECLADO", background_color=theme_manager.primary_color)
+        key_btn = theme_manager.bind_widget(Button(text="TECLADO"), background_color='primary_color')
         key_btn.bind(on_press=lambda x: app.show_numeric_keyboard())
         
         netflix_btn = Button(text="NETFLIX CAT", background_color=[0.9, 0.1, 0.1, 1], bold=True)
@@ -111,10 +99,8 @@ class RemotePortraitScreen(Screen):
         
         # VOLUME (Direita - Grande destaque)
         vol_box = BoxLayout(orientation='vertical', spacing=dp(5))
-        vol_up = Button(text="VOL +", font_size='22sp', bold=True, background_color=theme_manager.primary_color)
-        vol_up.bind(on_press=lambda x: app.send_command("VolumeUp"))
-        vol_down = Button(text="VOL -", font_size='22sp', bold=True, background_color=theme_manager.primary_color)
-        vol_down.bind(on_press=lambda x: app.send_command("VolumeDown"))
+        vol_up = theme_manager.bind_widget(self.key_button("VolumeUp", text="VOL +", font_size='22sp', bold=True), background_color='primary_color')
+        vol_down = theme_manager.bind_widget(self.key_button("VolumeDown", text="VOL -", font_size='22sp', bold=True), background_color='primary_color')
         vol_box.add_widget(vol_up)
         vol_box.add_widget(vol_down)
         control_layout.add_widget(vol_box)
@@ -1,5 +1,6 @@
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from collections import deque
 from kivy.uix.screenmanager import Screen
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.gridlayout import GridLayout
@@ -12,47 +13,64 @@ from kivy.clock import Clock
 from kivy.metrics import dp
 from kivy.app import App
 from kivy.graphics import Color, Rectangle
-from app.utils.network import get_local_ip_address, scan_single_ip
+from app.utils.discovery import iter_discovery_events
 from app.utils.themes import theme_manager
+from app.utils.perf import perf
 
 class ScanScreen(Screen):
+    # Máximo de TVs adicionadas à lista por frame
+    FOUND_PER_FRAME = 10
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.name = 'scan_screen'
-        theme_manager.bind(bg_color=self._update_bg)
-        self.build_ui()
-
-    def _update_bg(self, *args):
-        self.canvas.before.clear()
+        self._events = deque()
+        self._drain_event = None
+        self._scan = None   # AsyncEventIterator da busca em andamento
         with self.canvas.before:
-            Color(*theme_manager.bg_color)
+            self.bg = Color(*theme_manager.bg_color)
             self.rect = Rectangle(pos=self.pos, size=self.size)
-        self.build_ui()
+        theme_manager.bind_widget(self.bg, rgba='bg_color')
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        with perf.timer("ui.build." + self.name):
+            self.build_ui()
+
+    def _update_rect(self, *args):
+        self.rect.pos = self.pos
+        self.rect.size = self.size
 
     def build_ui(self):
-        self.clear_widgets()
+        # Montada uma única vez: a troca de tema só recolore os widgets,
+        # então a lista de TVs encontradas não se perde
         layout = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(10))
         
         # Cabeçalho e Temas
         header = BoxLayout(size_hint_y=None, height=dp(50))
-        header.add_widget(Label(text='CONTROLE AOC', font_size='24sp', bold=True, color=theme_manager.primary_color))
+        title = theme_manager.bind_widget(Label(text='CONTROLE AOC', font_size='24sp', bold=True), color='primary_color')
+        # Toque triplo no título liga/desliga o painel de desempenho
+        title.bind(on_touch_down=self._title_touched)
+        header.add_widget(title)
         layout.add_widget(header)
         
         theme_box = BoxLayout(size_hint_y=None, height=dp(40), spacing=dp(5))
-        theme_box.add_widget(Label(text="Tema:", color=theme_manager.text_color, size_hint_x=0.3))
+        theme_box.add_widget(theme_manager.bind_widget(Label(text="Tema:", size_hint_x=0.3), color='text_color'))
+        self.theme_buttons = {}
         for t_name in theme_manager.themes.keys():
-            btn = Button(text=t_name, font_size='12sp', background_color=theme_manager.primary_color if theme_manager.theme_name == t_name else [0.3, 0.3, 0.3, 1])
+            btn = Button(text=t_name, font_size='12sp')
             btn.bind(on_press=lambda x, n=t_name: theme_manager.set_theme(n))
             theme_box.add_widget(btn)
+            self.theme_buttons[t_name] = btn
+        self._highlight_theme()
+        theme_manager.bind(on_theme=self._highlight_theme)
         layout.add_widget(theme_box)
 
-        self.status_label = Label(text='Pronto para buscar sua TV', size_hint_y=None, height=dp(30), color=theme_manager.text_color)
+        self.status_label = theme_manager.bind_widget(Label(text='Pronto para buscar sua TV', size_hint_y=None, height=dp(30)), color='text_color')
         layout.add_widget(self.status_label)
         
         self.progress_bar = ProgressBar(max=254, value=0, size_hint_y=None, height=dp(10))
         layout.add_widget(self.progress_bar)
         
-        self.scan_btn = Button(text='BUSCAR TV NA REDE', size_hint_y=None, height=dp(50), background_color=theme_manager.primary_color, bold=True)
+        self.scan_btn = theme_manager.bind_widget(Button(text='BUSCAR TV NA REDE', size_hint_y=None, height=dp(50), bold=True), background_color='primary_color')
         self.scan_btn.bind(on_press=self.start_scan)
         layout.add_widget(self.scan_btn)
         
@@ -64,7 +82,7 @@ class ScanScreen(Screen):
         manual_box.add_widget(connect_btn)
         layout.add_widget(manual_box)
         
-        layout.add_widget(Label(text='TVs Encontradas:', size_hint_y=None, height=dp(25), color=theme_manager.text_color))
+        layout.add_widget(theme_manager.bind_widget(Label(text='TVs Encontradas:', size_hint_y=None, height=dp(25)), color='text_color'))
         
         scroll = ScrollView()
         self.tv_list = GridLayout(cols=1, spacing=dp(8), size_hint_y=None)
@@ -74,40 +92,96 @@ class ScanScreen(Screen):
         
         self.add_widget(layout)
 
+    def _title_touched(self, label, touch):
+        if touch.is_triple_tap and label.collide_point(*touch.pos):
+            App.get_running_app().toggle_perf_overlay()
+            return True
+
+    def _highlight_theme(self, *args):
+        for t_name, btn in self.theme_buttons.items():
+            btn.background_color = theme_manager.primary_color if theme_manager.theme_name == t_name else [0.3, 0.3, 0.3, 1]
+
     def start_scan(self, instance):
         self.scan_btn.disabled = True
         self.status_label.text = "Buscando TVs na rede local..."
         self.tv_list.clear_widgets()
         self.progress_bar.value = 0
-        threading.Thread(target=self._scan_thread, daemon=True).start()
-
-    def _scan_thread(self):
-        local_ip = get_local_ip_address()
-        prefix = ".".join(local_ip.split('.')[:3]) + "."
-        with ThreadPoolExecutor(max_workers=60) as executor:
-            futures = {executor.submit(scan_single_ip, f"{prefix}{i}"): i for i in range(1, 255)}
-            for i, future in enumerate(as_completed(futures)):
-                result = future.result()
-                if result:
-                    Clock.schedule_once(lambda dt, r=result: self.add_tv_entry(r[0], r[1]), 0)
-                Clock.schedule_once(lambda dt, v=i+1: self._update_progress(v), 0)
-        Clock.schedule_once(self._scan_finished, 0)
-
-    def _update_progress(self, val):
-        self.progress_bar.value = val
-
-    def _scan_finished(self, dt):
+        self._events.clear()
+        # A thread da busca só enfileira eventos; a interface os consome uma
+        # vez por frame, em lote, em vez de um Clock.schedule_once por host
+        self._drain_event = Clock.schedule_interval(self._drain_scan_events, 0)
+        # TVs já conhecidas (IP ou MAC), vizinhos da tabela ARP e anúncios
+        # SSDP/mDNS primeiro, depois todas as sub-redes
+        self._scan = iter_discovery_events()
+        threading.Thread(target=self._scan_thread, args=(self._scan,), daemon=True).start()
+
+    def stop_scan(self):
+        """Interrompe a busca em andamento (o usuário já escolheu uma TV)."""
+        if self._scan is None:
+            return
+        # Fecha a busca daqui mesmo: a espera pelo próximo evento e as
+        # verificações que faltam são canceladas na hora
+        self._scan.close()
+        if self._drain_event is not None:
+            self._drain_event.cancel()
+        self._scan_finished(interrupted=True)
+
+    def on_leave(self, *args):
+        self.stop_scan()
+
+    def _scan_thread(self, events):
+        start = time.perf_counter()
+        first_found = False
+        with perf.timer("scan.total"):
+            for event in events:
+                if events is not self._scan:
+                    return   # interrompida (close() já cancelou o resto)
+                if event.kind == 'found':
+                    perf.count("scan.tvs")
+                    if not first_found:
+                        first_found = True
+                        perf.record("scan.first_tv", (time.perf_counter() - start) * 1000)
+                self._events.append(event)
+
+    def _drain_scan_events(self, dt):
+        progress = None
+        found = 0
+        while self._events and found < self.FOUND_PER_FRAME:
+            event = self._events.popleft()
+            if event.kind == 'found':
+                self.add_tv_entry(event.ip, event.name)
+                found += 1
+            elif event.kind == 'progress':
+                progress = event
+            elif event.kind == 'done':
+                self.progress_bar.max = max(event.total, 1)
+                self.progress_bar.value = event.done
+                self._scan_finished()
+                return False
+        if progress is not None:
+            self.progress_bar.max = max(progress.total, 1)
+            self.progress_bar.value = progress.done
+
+    def _scan_finished(self, interrupted=False):
+        self._drain_event = None
+        self._scan = None
         self.scan_btn.disabled = False
-        if not self.tv_list.children:
+        if interrupted:
+            self.status_label.text = "Busca interrompida."
+        elif not self.tv_list.children:
             self.status_label.text = "Nenhuma TV encontrada."
         else:
             self.status_label.text = "Busca finalizada!"
 
     def add_tv_entry(self, ip, name):
         btn = Button(text=f"{name} ({ip})", size_hint_y=None, height=dp(60), background_color=[0.2, 0.2, 0.2, 1])
-        btn.bind(on_press=lambda x: App.get_running_app().connect_to_tv(ip))
+        btn.bind(on_press=lambda x: self._connect(ip))
         self.tv_list.add_widget(btn)
 
+    def _connect(self, ip):
+        self.stop_scan()
+        App.get_running_app().connect_to_tv(ip)
+
     def manual_connect(self, instance):
         ip = self.ip_input.text.strip()
-        if ip: App.get_running_app().connect_to_tv(ip)
+        if ip: self._connect(ip)
@@ -0,0 +1,103 @@
+from app.utils.network import connection_manager, post_tv_key, TransportError
+from app.utils.registry import tv_registry
+
+# Teclas JointSpace conhecidas (as da v1 mais as usadas pelas telas do app)
+KNOWN_KEYS = [
+    "Standby", "Back", "Find", "Home", "Menu", "Info", "Options", "Adjust", "Source", "WatchTV",
+    "CursorUp", "CursorDown", "CursorLeft", "CursorRight", "Confirm",
+    "VolumeUp", "VolumeDown", "Mute",
+    "ChannelUp", "ChannelDown", "ChannelStepUp", "ChannelStepDown",
+    "RedColour", "GreenColour", "YellowColour", "BlueColour",
+    "PlayPause", "Pause", "Stop", "FastForward", "Rewind", "Record", "Next", "Previous",
+    "Teletext", "Subtitle", "Viewmode", "Online", "AmbilightOnOff", "Dot",
+] + [f"Digit{d}" for d in range(10)]
+
+# Endpoints consultados uma vez por modelo/firmware. Um GET num endpoint só
+# de POST responde 405, o que também conta como "existe".
+PROBED_ENDPOINTS = ["/1/input/key", "/1/input/text", "/1/audio/volume", "/1/sources", "/1/ambilight/mode"]
+EXISTING_STATUS = (200, 405)
+
+# Respostas de /1/input/key que indicam tecla desconhecida para o modelo. Um
+# 404 é o endpoint (ou a versão da API) que falta, não a tecla: não conta.
+KEY_REJECTED_STATUS = (400,)
+
+# Retorno de send_key para tecla barrada localmente (nada foi à rede)
+BLOCKED = "blocked"
+
+# Sobe quando muda o que vai no cache: caches de outra versão são sondados de novo
+CAPS_VERSION = 2
+
+class TvCapabilities:
+    """
+    Capacidades de cada modelo de TV, descobertas ao conectar e guardadas em
+    disco (tv_registry, por modelo) junto com o firmware. Se o firmware
+    informado por /1/system mudar, o cache é descartado e a TV é sondada de
+    novo. Teclas recusadas pela TV (400) entram no cache como não suportadas
+    e passam a ser barradas localmente, sem custo de rede. Os endpoints
+    encontrados decidem o que o app consulta (estado da TV, texto) e quais
+    botões ficam ativos (Ambilight).
+    """
+
+    def __init__(self, registry=tv_registry, manager=connection_manager):
+        self.registry = registry
+        self.manager = manager
+
+    def probe(self, ip, port, system):
+        """`system` é o JSON de /1/system. Devolve as capacidades do modelo."""
+        model = system.get('model') or ip
+        firmware = system.get('softwareversion')
+        self.registry.update(ip, model=model)
+        cached = self.registry.get_model(model)
+        if cached and cached.get('firmware') == firmware and cached.get('version') == CAPS_VERSION:
+            self._apply_text_support(ip, cached)
+            return cached
+
+        endpoints = {}
+        for path in PROBED_ENDPOINTS:
+            try:
+                endpoints[path] = self.manager.get(ip, port, path).status_code in EXISTING_STATUS
+            except TransportError:
+                endpoints[path] = None  # sem resposta: não dá para afirmar nada
+        caps = {'version': CAPS_VERSION, 'firmware': firmware, 'endpoints': endpoints, 'unsupported_keys': []}
+        if endpoints.get("/1/ambilight/mode") is False:
+            caps['unsupported_keys'].append("AmbilightOnOff")
+        self.registry.set_model(model, caps)
+        self._apply_text_support(ip, caps)
+        return caps
+
+    def _apply_text_support(self, ip, caps):
+        # Aproveita a sondagem para a TextInputPipeline já saber que há
+        # /1/input/text. Um 404 no GET não prova que o POST falharia, então
+        # a ausência continua sendo descoberta pela própria pipeline.
+        if caps.get('endpoints', {}).get("/1/input/text"):
+            self.registry.update(ip, text_endpoint=True)
+
+    def supported_keys(self, model):
+        caps = self.registry.get_model(model) if model else None
+        unsupported = set(caps.get('unsupported_keys', ())) if caps else set()
+        return [key for key in KNOWN_KEYS if key not in unsupported]
+
+    def is_supported(self, model, key):
+        caps = self.registry.get_model(model) if model else None
+        return not caps or key not in caps.get('unsupported_keys', ())
+
+    def send_key(self, ip, port, key, model=None):
+        """
+        Envia a tecla, a menos que o modelo já a tenha recusado antes.
+        Devolve o status HTTP, BLOCKED se foi barrada localmente ou None se a
+        rede falhou.
+        """
+        if not self.is_supported(model, key):
+            return BLOCKED
+        try:
+            status = post_tv_key(ip, port, key)
+        except TransportError:
+            return None
+        if status in KEY_REJECTED_STATUS and model:
+            caps = self.registry.get_model(model) or {'unsupported_keys': []}
+            caps['unsupported_keys'] = sorted(set(caps.get('unsupported_keys', [])) | {key})
+            self.registry.set_model(model, caps)
+        return status
+
+# Instância global
+tv_capabilities = TvCapabilities()
@@ -0,0 +1,75 @@
+"""
+Catálogo de categorias Netflix pré-compilado.
+
+O JSON/CSV de `assets/` é convertido (uma vez, no build) num arquivo com o
+índice de busca já montado, para que o app não precise normalizar os nomes
+nem montar o índice na abertura:
+
+    python -m app.utils.catalog [origem.json|origem.csv] [destino.bin]
+
+O arquivo guarda só dados (itens, nomes normalizados e as listas de ids de
+cada n-grama e palavra, ver CategoryIndex.to_data) em JSON comprimido com
+zlib, depois de um cabeçalho com a versão. Nada de objetos serializados: um
+arquivo de outra versão do índice é recusado e o app volta para o JSON.
+"""
+import csv
+import json
+import os
+import sys
+import zlib
+
+from app.utils.search import CategoryIndex
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'assets')
+SOURCE_JSON = os.path.join(ASSETS_DIR, 'netflix_codes_full.json')
+COMPILED_FILE = os.path.join(ASSETS_DIR, 'netflix_categories.bin')
+
+MAGIC = b"AOCCAT"
+FORMAT_VERSION = 2
+
+def load_source(path):
+    """Lê o JSON ou CSV de categorias e devolve a lista de dicts {'name', 'code'}."""
+    with open(path, mode='r', encoding='utf-8', newline='') as f:
+        if path.endswith('.csv'):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = json.load(f)
+    return [
+        {'name': f"{row.get('category', '')} - {row.get('subcategory', '')}", 'code': row.get('code', '')}
+        for row in rows
+    ]
+
+def compile_catalog(source=SOURCE_JSON, destination=COMPILED_FILE):
+    index = CategoryIndex(load_source(source))
+    data = json.dumps(index.to_data(), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    tmp_path = destination + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + bytes([FORMAT_VERSION]))
+        f.write(zlib.compress(data, 9))
+    os.replace(tmp_path, destination)
+    return index
+
+def load_compiled(path=COMPILED_FILE):
+    """Carrega o índice compilado; None se o arquivo não existir, for de outra versão ou estiver corrompido."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(len(MAGIC) + 1)
+            if header != MAGIC + bytes([FORMAT_VERSION]):
+                return None
+            data = json.loads(zlib.decompress(f.read()).decode('utf-8'))
+        return CategoryIndex.from_data(data)
+    except (OSError, zlib.error, ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+def load_catalog():
+    """Índice compilado se houver; senão monta a partir do JSON (mais lento)."""
+    index = load_compiled()
+    if index is None and os.path.exists(SOURCE_JSON):
+        index = CategoryIndex(load_source(SOURCE_JSON))
+    return index
+
+if __name__ == '__main__':
+    src = sys.argv[1] if len(sys.argv) > 1 else SOURCE_JSON
+    dst = sys.argv[2] if len(sys.argv) > 2 else COMPILED_FILE
+    compiled = compile_catalog(src, dst)
+    print(f"{len(compiled)} categorias -> {dst} ({os.path.getsize(dst)} bytes)")
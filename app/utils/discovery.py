@@ -0,0 +1,320 @@
+"""
+Descoberta de TVs em todas as redes do aparelho.
+
+A ordem de verificação é: TVs já vistas (do tv_data.json, pelo IP ou pelo
+MAC na tabela de vizinhos do kernel), vizinhos com o prefixo de fabricante
+(OUI) de uma TV já vista ou de um fornecedor conhecido de TVs, hosts que responderam a anúncios SSDP/mDNS,
+os demais vizinhos vivos e, por último, a varredura de todas as sub-redes
+IPv4 das interfaces ativas. Quem volta a usar o app costuma achar a TV nas
+primeiras verificações, sem esperar a varredura.
+"""
+import asyncio
+import ipaddress
+import itertools
+import socket
+import struct
+import subprocess
+
+from app.utils.network import ScanEvent, async_check_tv, cancel_and_wait, get_local_ip_address, iter_async_events
+from app.utils.registry import tv_registry
+
+# Prioridades da fila de verificação (menor = antes)
+PRIORITY_KNOWN = 0
+PRIORITY_VENDOR = 1
+PRIORITY_ANNOUNCED = 2
+PRIORITY_NEIGHBOR = 3
+PRIORITY_SWEEP = 4
+
+ARP_TABLE = "/proc/net/arp"
+
+# OUIs dos fornecedores conhecidos das TVs/módulos de rede das TVs AOC/Philips
+# (TP Vision e os chips Wi-Fi/Ethernet usados nas placas). Somados aos OUIs
+# das TVs já vistas, para que a primeira busca também comece por elas; um
+# vizinho com o mesmo chip que não seja TV só é verificado um pouco antes.
+TV_VENDOR_OUIS = frozenset({
+    "70:af:24",  # TP Vision (TVs Philips)
+    "00:0c:e7",  # MediaTek
+    "00:0c:43",  # Ralink (MediaTek)
+    "00:e0:4c",  # Realtek
+})
+
+# Redes maiores que isto (ex.: /16 de rede corporativa) são limitadas ao
+# bloco /22 em volta do IP do aparelho
+MIN_PREFIX_LEN = 22
+
+SIOCGIFADDR = 0x8915
+SIOCGIFNETMASK = 0x891b
+
+SSDP_ADDR = ("239.255.255.250", 1900)
+SSDP_SEARCH = (
+    "M-SEARCH * HTTP/1.1\r\n"
+    "HOST: 239.255.255.250:1900\r\n"
+    "MAN: \"ssdp:discover\"\r\n"
+    "MX: 1\r\n"
+    "ST: ssdp:all\r\n\r\n"
+).encode('ascii')
+
+MDNS_ADDR = ("224.0.0.251", 5353)
+
+def _mdns_query(name="_services._dns-sd._udp.local"):
+    # Consulta PTR com o bit "unicast response", para a resposta vir direto
+    # para a nossa porta em vez do grupo multicast
+    header = struct.pack("!HHHHHH", 0, 0, 1, 0, 0, 0)
+    qname = b"".join(bytes([len(part)]) + part.encode('ascii') for part in name.split(".")) + b"\0"
+    return header + qname + struct.pack("!HH", 12, 0x8001)
+
+MDNS_QUERY = _mdns_query()
+
+def _ioctl_ipv4(sock, request, ifname):
+    import fcntl
+    packed = fcntl.ioctl(sock.fileno(), request, struct.pack('256s', ifname[:15].encode()))
+    return socket.inet_ntoa(packed[20:24])
+
+def list_ipv4_interfaces():
+    """
+    [(interface, ip, máscara)] das interfaces IPv4 ativas, sem loopback e
+    link-local. Onde não der para listar (sem fcntl), usa o IP da rota padrão.
+    """
+    interfaces = []
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            for _, ifname in socket.if_nameindex():
+                try:
+                    ip = _ioctl_ipv4(sock, SIOCGIFADDR, ifname)
+                    netmask = _ioctl_ipv4(sock, SIOCGIFNETMASK, ifname)
+                except OSError:
+                    continue
+                address = ipaddress.IPv4Address(ip)
+                if address.is_loopback or address.is_link_local:
+                    continue
+                interfaces.append((ifname, ip, netmask))
+    except (ImportError, OSError, AttributeError):
+        pass
+    if not interfaces:
+        ip = get_local_ip_address()
+        if not ip.startswith("127."):
+            interfaces.append(("default", ip, "255.255.255.0"))
+    return interfaces
+
+def interface_hosts(ip, netmask):
+    """Hosts da sub-rede da interface, começando pelos vizinhos da mesma /24."""
+    network = ipaddress.IPv4Interface(f"{ip}/{netmask}").network
+    if network.prefixlen < MIN_PREFIX_LEN:
+        network = ipaddress.IPv4Network(f"{ip}/{MIN_PREFIX_LEN}", strict=False)
+    own_24 = ipaddress.IPv4Network(f"{ip}/24", strict=False)
+    hosts = [str(h) for h in network.hosts() if str(h) != ip]
+    hosts.sort(key=lambda h: ipaddress.IPv4Address(h) not in own_24)
+    return hosts
+
+def known_hosts():
+    """IPs já vistos no registro, do visto mais recentemente ao mais antigo."""
+    tvs = tv_registry.all()
+    return sorted(tvs, key=lambda ip: tvs[ip].get("last_seen", 0), reverse=True)
+
+def read_neighbors(path=ARP_TABLE):
+    """
+    {ip: mac} dos vizinhos IPv4 com MAC resolvido, de /proc/net/arp ou, se
+    não der para ler (o Android 10+ bloqueia), de `ip neigh`. {} se nenhum.
+    """
+    neighbors = {}
+    try:
+        with open(path) as table:
+            next(table, None)
+            for line in table:
+                # IP, tipo, flags, MAC, máscara, interface; flags 0x0 = sem resposta
+                fields = line.split()
+                if len(fields) >= 4 and fields[2] != "0x0" and fields[3] != "00:00:00:00:00:00":
+                    neighbors[fields[0]] = fields[3].lower()
+        return neighbors
+    except OSError:
+        pass
+    try:
+        output = subprocess.run(["ip", "-4", "neigh", "show"], capture_output=True, text=True, timeout=1).stdout
+    except (OSError, subprocess.SubprocessError):
+        return neighbors
+    for line in output.splitlines():
+        # 192.168.0.20 dev wlan0 lladdr aa:bb:cc:dd:ee:ff REACHABLE
+        fields = line.split()
+        if "lladdr" in fields and fields[-1] not in ("FAILED", "INCOMPLETE"):
+            neighbors[fields[0]] = fields[fields.index("lladdr") + 1].lower()
+    return neighbors
+
+def known_macs():
+    """{mac: ip} das TVs do registro cujo MAC já foi visto."""
+    return {entry["mac"]: ip for ip, entry in tv_registry.all().items() if entry.get("mac")}
+
+def remember_mac(ip, neighbors=None):
+    """Guarda no registro o MAC da TV em `ip`, para achá-la depois mesmo se o IP mudar."""
+    mac = (read_neighbors() if neighbors is None else neighbors).get(ip)
+    entry = tv_registry.get(ip)
+    if mac and entry is not None and entry.get("mac") != mac:
+        tv_registry.update(ip, mac=mac)
+    return mac
+
+def neighbor_priorities(neighbors, macs=None, sweep=True, vendor_ouis=TV_VENDOR_OUIS):
+    """
+    Prioridade de cada vizinho: MAC de TV conhecida, OUI (3 primeiros bytes)
+    de TV conhecida ou de `vendor_ouis` e, se `sweep`, qualquer outro vizinho vivo.
+    """
+    macs = known_macs() if macs is None else macs
+    ouis = set(vendor_ouis) | {mac[:8] for mac in macs}
+    priorities = {}
+    for ip, mac in neighbors.items():
+        if mac in macs:
+            priorities[ip] = PRIORITY_KNOWN
+        elif mac[:8] in ouis:
+            priorities[ip] = PRIORITY_VENDOR
+        elif sweep:
+            priorities[ip] = PRIORITY_NEIGHBOR
+    return priorities
+
+class _AnnouncementProtocol(asyncio.DatagramProtocol):
+    def __init__(self, on_host):
+        self.on_host = on_host
+
+    def datagram_received(self, data, addr):
+        self.on_host(addr[0])
+
+    def error_received(self, exc):
+        pass
+
+async def listen_announcements(on_host, duration=1.5):
+    """
+    Envia buscas SSDP e mDNS e chama `on_host(ip)` para cada resposta
+    durante `duration` segundos. As respostas são só candidatas: quem
+    decide se é TV é o /1/system.
+    """
+    loop = asyncio.get_running_loop()
+    transports = []
+    for message, target in ((SSDP_SEARCH, SSDP_ADDR), (MDNS_QUERY, MDNS_ADDR)):
+        try:
+            transport, _ = await loop.create_datagram_endpoint(
+                lambda: _AnnouncementProtocol(on_host), local_addr=("0.0.0.0", 0)
+            )
+        except OSError:
+            continue
+        transports.append(transport)
+        for _ in range(2):  # UDP pode se perder; manda duas vezes
+            try:
+                transport.sendto(message, target)
+            except OSError:
+                pass
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        for transport in transports:
+            transport.close()
+
+async def discovery_events(interfaces=None, hints=None, tv_port=1925, concurrency=64,
+                           probe_timeout=None, timeout=None, listen_time=1.5, announcements=True,
+                           neighbors=None):
+    """
+    Descoberta como fluxo de ScanEvent (mesmo formato de `scan_events`).
+    `total` cresce se um anúncio trouxer um host fora das sub-redes varridas.
+    `neighbors` ({ip: mac}) substitui a tabela de vizinhos do kernel; sem
+    sub-redes para varrer, só vizinhos com MAC/OUI de TV são verificados.
+    """
+    loop = asyncio.get_running_loop()
+    interfaces = list_ipv4_interfaces() if interfaces is None else interfaces
+    hints = known_hosts() if hints is None else hints
+    # A leitura da tabela pode ser um `ip neigh` (até 1 s): fora do loop
+    if neighbors is None:
+        neighbors = await loop.run_in_executor(None, read_neighbors)
+    table = dict(neighbors)
+    own_ips = {ip for _, ip, _ in interfaces}
+
+    queue = asyncio.PriorityQueue()
+    results = asyncio.Queue()
+    priorities = {}
+    checked = set()
+    order = itertools.count()
+    stopping = asyncio.Event()   # o consumidor fechou o fluxo
+
+    def enqueue(ip, priority):
+        # Um host já na fila pode subir de prioridade (ex.: respondeu ao SSDP)
+        if ip in own_ips or ip in checked or priorities.get(ip, priority + 1) <= priority:
+            return
+        priorities[ip] = priority
+        queue.put_nowait((priority, next(order), ip))
+
+    async def learn_mac(ip):
+        # O connect da verificação deixou o MAC da TV na tabela de vizinhos;
+        # só relê a tabela (fora do loop) se o IP ainda não estava nela
+        if ip not in table:
+            table.update(await loop.run_in_executor(None, read_neighbors))
+        remember_mac(ip, table)
+
+    async def worker():
+        # O flag é conferido depois de cada await: um cancel() engolido pelo
+        # wait_for não pode deixar o worker pegando hosts da fila
+        while not stopping.is_set():
+            _, _, ip = await queue.get()
+            try:
+                if stopping.is_set() or ip in checked:
+                    continue
+                checked.add(ip)
+                name = await async_check_tv(ip, tv_port, probe_timeout, timeout)
+                if not stopping.is_set():
+                    results.put_nowait((ip, name))
+                    if name:
+                        await learn_mac(ip)
+            finally:
+                queue.task_done()
+
+    async def feed():
+        if announcements:
+            listener = asyncio.ensure_future(
+                listen_announcements(lambda ip: enqueue(ip, PRIORITY_ANNOUNCED), listen_time)
+            )
+        for ip in hints:
+            enqueue(ip, PRIORITY_KNOWN)
+        for ip, priority in neighbor_priorities(neighbors, sweep=bool(interfaces)).items():
+            enqueue(ip, priority)
+        for _, ip, netmask in interfaces:
+            for host in interface_hosts(ip, netmask):
+                enqueue(host, PRIORITY_SWEEP)
+        if announcements:
+            await listener
+        await queue.join()
+        await results.put(None)
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    tasks.append(asyncio.ensure_future(feed()))
+    done = 0
+    try:
+        while True:
+            item = await results.get()
+            if item is None:
+                break
+            ip, name = item
+            done += 1
+            if name:
+                yield ScanEvent('found', ip, name, done, len(priorities))
+            yield ScanEvent('progress', ip, None, done, len(priorities))
+    finally:
+        stopping.set()
+        await cancel_and_wait(tasks)
+    yield ScanEvent('done', None, None, done, len(priorities))
+
+def iter_discovery_events(**kwargs):
+    """Versão síncrona de `discovery_events`."""
+    return iter_async_events(discovery_events(**kwargs))
+
+def find_tv(serial, exclude=(), tv_port=1925, listen_time=1.5):
+    """
+    Procura a TV de número de série `serial` que mudou de IP, sem varrer as
+    sub-redes: só os IPs do registro, o vizinho com o MAC dela e quem
+    responder aos anúncios SSDP/mDNS. Devolve o novo IP ou None.
+    """
+    hints = [ip for ip in known_hosts() if ip not in exclude]
+    events = iter_discovery_events(interfaces=[], hints=hints, tv_port=tv_port, listen_time=listen_time)
+    try:
+        for event in events:
+            if event.kind == 'found' and event.ip not in exclude:
+                entry = tv_registry.get(event.ip) or {}
+                if entry.get("serial") == serial:
+                    return event.ip
+    finally:
+        # Cancela as verificações que ainda faltam (sem esperar o coletor de lixo)
+        events.close()
+    return None
@@ -0,0 +1,196 @@
+import threading
+import time
+from collections import deque
+
+from app.utils.perf import perf
+
+# Teclas que podem ser agrupadas quando pressionadas várias vezes seguidas
+REPEATABLE_KEYS = {
+    "VolumeUp", "VolumeDown",
+    "ChannelUp", "ChannelDown",
+    "CursorUp", "CursorDown", "CursorLeft", "CursorRight",
+}
+
+class _Command:
+    __slots__ = ("kind", "payload", "count", "queued_at", "last_at")
+
+    def __init__(self, kind, payload, now):
+        self.kind = kind
+        self.payload = payload
+        self.count = 1
+        self.queued_at = now
+        self.last_at = now
+
+    @property
+    def repeatable(self):
+        return self.kind == "key" and self.payload in REPEATABLE_KEYS
+
+class CommandDispatcher:
+    """
+    Fila única de comandos para a TV, atendida por uma só thread.
+
+    Mantém a ordem das teclas, agrupa repetições de volume/canal/cursor
+    feitas dentro de `coalesce_window` segundos e, quando a TV está lenta,
+    descarta repetições velhas em vez de acumulá-las. Não depende do Kivy:
+    `send_key(tecla)` e `send_text(texto)` são funções comuns; as macros
+    usam o mesmo `send_key`.
+    """
+
+    def __init__(self, send_key, send_text, max_queue=32, coalesce_window=0.15, stale_after=2.0):
+        self.send_key = send_key
+        self.send_text = send_text
+        self.max_queue = max_queue
+        self.coalesce_window = coalesce_window
+        self.stale_after = stale_after
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._sent = 0
+        self._batches = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._throttled = 0
+        self._in_flight = 0     # envios do comando atual que ainda não terminaram
+        self._current = None
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+        self._latency_last = 0.0
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="tv-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            # Macros e textos (MacroRun/TextEntry) são cancelados: o em
+            # andamento para nas esperas entre teclas e termina sozinho; os
+            # da fila, que não vão mais sair, terminam aqui, para ninguém
+            # ficar esperando `finished` para sempre
+            if self._current is not None and hasattr(self._current.payload, "cancel"):
+                self._current.payload.cancel()
+            for command in self._queue:
+                payload = command.payload
+                if hasattr(payload, "cancel"):
+                    payload.cancel()
+                    if payload.ok is None:
+                        payload.ok = False
+                    payload.finished.set()
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit_key(self, key):
+        return self._submit("key", key)
+
+    def submit_repeat(self, key, max_pending=2):
+        """
+        Repetição de tecla segurada. Só entra se houver menos de `max_pending`
+        envios pendentes (na fila ou em andamento): com a TV lenta, o ritmo
+        das repetições cai para o que ela consegue atender.
+        """
+        with self._cond:
+            if self._in_flight + sum(c.count for c in self._queue) >= max_pending:
+                self._throttled += 1
+                perf.count("dispatcher.throttled")
+                return False
+        return self._submit("key", key)
+
+    def submit_text(self, text):
+        return self._submit("text", text)
+
+    def submit_macro(self, run):
+        """`run` é um MacroRun; as teclas dele saem em sequência, sem intercalar com outras."""
+        return self._submit("macro", run)
+
+    def _submit(self, kind, payload):
+        now = time.monotonic()
+        with self._cond:
+            if not self._running:
+                return False
+            last = self._queue[-1] if self._queue else None
+            if (last is not None and last.repeatable and last.kind == kind and last.payload == payload
+                    and now - last.last_at <= self.coalesce_window):
+                last.count += 1
+                last.last_at = now
+                self._coalesced += 1
+                return True
+            if len(self._queue) >= self.max_queue:
+                # Fila cheia: sacrifica a repetição mais antiga; se só houver
+                # comandos que não podem ser perdidos, recusa o novo.
+                victim = next((c for c in self._queue if c.repeatable), None)
+                if victim is None:
+                    self._dropped += 1
+                    return False
+                self._queue.remove(victim)
+                self._dropped += victim.count
+            self._queue.append(_Command(kind, payload, now))
+            self._cond.notify()
+            return True
+
+    def _next(self):
+        with self._cond:
+            while self._running:
+                while self._queue:
+                    command = self._queue.popleft()
+                    if command.repeatable and time.monotonic() - command.last_at > self.stale_after:
+                        self._dropped += command.count
+                        continue
+                    self._in_flight = command.count
+                    self._current = command
+                    return command
+                self._cond.wait()
+            return None
+
+    def _run(self):
+        while True:
+            command = self._next()
+            if command is None:
+                return
+            send = {"key": self.send_key, "text": self.send_text, "macro": self._run_macro}[command.kind]
+            for _ in range(command.count):
+                try:
+                    send(command.payload)
+                except Exception:
+                    pass
+                with self._cond:
+                    self._in_flight -= 1
+            latency = time.monotonic() - command.queued_at
+            # Do toque até a TV responder, fila incluída
+            perf.record("dispatcher." + command.kind, latency * 1000)
+            with self._cond:
+                self._current = None
+                self._sent += command.count
+                self._batches += 1
+                self._latency_total += latency
+                self._latency_max = max(self._latency_max, latency)
+                self._latency_last = latency
+
+    def _run_macro(self, run):
+        run.execute(self.send_key)
+
+    @property
+    def depth(self):
+        with self._cond:
+            return sum(c.count for c in self._queue)
+
+    def stats(self):
+        with self._cond:
+            batches = self._batches
+            return {
+                "depth": sum(c.count for c in self._queue),
+                "sent": self._sent,
+                "dropped": self._dropped,
+                "coalesced": self._coalesced,
+                "throttled": self._throttled,
+                "latency_last_ms": self._latency_last * 1000,
+                "latency_avg_ms": (self._latency_total / batches * 1000) if batches else 0.0,
+                "latency_max_ms": self._latency_max * 1000,
+            }
@@ -0,0 +1,154 @@
+"""
+Modo frota: a mesma tecla, texto ou macro para várias TVs ao mesmo tempo,
+sem interface. Os alvos são IPs, nomes personalizados do tv_data.json ou
+padrões de nome ("Sala 2*"), e `@grupo` para o campo group do registro.
+
+Cada TV tem a sua conexão keep-alive no TvConnectionManager; os envios
+rodam em paralelo (no máximo `concurrency` de uma vez), então mandar
+Standby para 50 telas custa perto de um RTT, não 50.
+"""
+import fnmatch
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from app.utils.macros import MacroRun, parse_steps
+from app.utils.network import TvConnectionManager, TextEntry, TextInputPipeline, TransportError
+from app.utils.registry import tv_registry
+
+DEFAULT_PORT = 1925
+
+FleetTarget = namedtuple('FleetTarget', 'ip port name')
+
+# Resultado por TV: ok, status HTTP (ou None), erro (texto) e tempo em ms
+FleetResult = namedtuple('FleetResult', 'ip name ok status error elapsed_ms')
+
+class FleetReport:
+    def __init__(self, results, elapsed_ms):
+        self.results = sorted(results, key=lambda r: (r.name or "", r.ip))
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def ok(self):
+        return all(r.ok for r in self.results)
+
+    @property
+    def failed(self):
+        return [r for r in self.results if not r.ok]
+
+    def summary(self):
+        times = sorted(r.elapsed_ms for r in self.results if r.ok)
+        return {
+            "tvs": len(self.results),
+            "ok": len(times),
+            "failed": len(self.results) - len(times),
+            "wall_ms": self.elapsed_ms,
+            "p50_ms": times[len(times) // 2] if times else None,
+            "max_ms": times[-1] if times else None,
+        }
+
+class Fleet:
+    def __init__(self, registry=tv_registry, manager=None, concurrency=64, idle_timeout=300):
+        self.registry = registry
+        # Conexões da frota ficam abertas por mais tempo que as do app
+        self.manager = manager or TvConnectionManager(idle_timeout=idle_timeout)
+        self.text_pipeline = TextInputPipeline(self.manager, registry)
+        self.concurrency = concurrency
+        # Threads reaproveitadas entre comandos, como as conexões
+        self._executor = None
+
+    def _target(self, ip, entry=None):
+        entry = entry if entry is not None else (self.registry.get(ip) or {})
+        return FleetTarget(ip, entry.get("port", DEFAULT_PORT), entry.get("name"))
+
+    def resolve(self, patterns=None):
+        """
+        TVs que batem com algum padrão (todas as do registro se nenhum).
+        Nomes e padrões não diferenciam maiúsculas; um IP fora do registro
+        também vale.
+        """
+        tvs = self.registry.all()
+        if not patterns:
+            return [self._target(ip, entry) for ip, entry in sorted(tvs.items())]
+        targets = {}
+        for pattern in patterns:
+            if pattern.startswith("@"):
+                group = pattern[1:].casefold()
+                matches = [ip for ip, e in tvs.items() if (e.get("group") or "").casefold() == group]
+            else:
+                lowered = pattern.casefold()
+                matches = [ip for ip, e in tvs.items()
+                           if fnmatch.fnmatchcase(ip, pattern) or fnmatch.fnmatchcase((e.get("name") or "").casefold(), lowered)]
+                if not matches and pattern[:1].isdigit() and not any(ch in pattern for ch in "*?["):
+                    matches = [pattern]
+            if not matches:
+                raise ValueError(f"Nenhuma TV corresponde a {pattern!r}")
+            for ip in matches:
+                targets[ip] = self._target(ip, tvs.get(ip, {}))
+        return sorted(targets.values(), key=lambda t: t.ip)
+
+    def set_group(self, ip, group):
+        self.registry.update(ip, group=group)
+
+    def _run(self, targets, action):
+        def timed(target):
+            start = time.perf_counter()
+            try:
+                # A ação devolve (ok, status) ou (ok, status, motivo)
+                ok, status, *reason = action(target)
+                if ok:
+                    error = None
+                elif reason and reason[0]:
+                    error = reason[0]
+                else:
+                    error = f"HTTP {status}" if status else "recusado"
+            except TransportError as e:
+                ok, status, error = False, None, type(e).__name__
+            return FleetResult(target.ip, target.name, ok, status, error, (time.perf_counter() - start) * 1000)
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="fleet")
+        start = time.perf_counter()
+        results = list(self._executor.map(timed, targets))
+        return FleetReport(results, (time.perf_counter() - start) * 1000)
+
+    def connect(self, targets):
+        """Abre (e confere) a conexão com cada TV via /1/system, para os envios já saírem aquecidos."""
+        def ping(target):
+            res = self.manager.get(target.ip, target.port, "/1/system")
+            if res.status_code == 200:
+                try:
+                    system = res.json()
+                    self.registry.mark_seen(target.ip, target.port, system.get('model'), system.get('serialnumber'))
+                except ValueError:
+                    pass
+            return res.status_code == 200, res.status_code
+        return self._run(targets, ping)
+
+    def send_key(self, targets, key):
+        def send(target):
+            status = self.manager.post_key(target.ip, target.port, key).status_code
+            return status == 200, status
+        return self._run(targets, send)
+
+    def send_text(self, targets, text):
+        def send(target):
+            entry = TextEntry(text)
+            return self.text_pipeline.send(target.ip, target.port, entry), None, entry.error
+        return self._run(targets, send)
+
+    def run_macro(self, targets, steps, name="frota"):
+        """Macro em cada TV: teclas em sequência dentro da TV, TVs em paralelo."""
+        steps = parse_steps(steps)  # passo inválido falha aqui, antes de tocar em qualquer TV
+        def run(target):
+            send = lambda key: self.manager.post_key(target.ip, target.port, key).status_code == 200
+            macro = MacroRun(name, steps)
+            macro.execute(send)
+            return macro.ok, None
+        return self._run(targets, run)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.manager.close_all()
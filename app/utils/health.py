@@ -0,0 +1,146 @@
+"""
+Monitor da conexão com a TV conectada.
+
+Um /1/system de tempos em tempos (só se nenhuma tecla recente já provou que
+a TV responde) classifica a conexão em conectada, instável ou perdida. Com
+falhas, as novas tentativas começam rápidas e vão se espaçando. Perdida a
+TV, ela é procurada pelo número de série entre os IPs conhecidos e quem
+responder aos anúncios da rede, para o caso de o DHCP ter trocado o IP.
+"""
+import threading
+import time
+
+from app.utils.discovery import find_tv
+from app.utils.network import connection_manager, TransportError
+from app.utils.registry import tv_registry
+
+CONNECTED = "connected"
+DEGRADED = "degraded"
+LOST = "lost"
+
+class ConnectionMonitor:
+    """
+    `on_state(estado)` e `on_moved(novo_ip)` são chamados na thread do
+    monitor. `report(ok)` recebe o resultado das teclas enviadas, que
+    contam como pings de graça.
+    """
+
+    def __init__(self, on_state=None, on_moved=None, manager=connection_manager, registry=tv_registry,
+                 interval=15.0, retry_interval=2.0, max_interval=120.0, lost_after=3, find=find_tv):
+        self.on_state = on_state
+        self.on_moved = on_moved
+        self.manager = manager
+        self.registry = registry
+        self.interval = interval
+        self.retry_interval = retry_interval
+        self.max_interval = max_interval
+        self.lost_after = lost_after
+        self.find = find
+        self.ip = None
+        self.port = None
+        self.serial = None
+        self.state = None
+        self.failures = 0
+        self._last_ok = 0.0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, ip, port, serial=None):
+        """Passa a monitorar `ip`; a chamada de /1/system que conectou conta como o primeiro ping."""
+        self.stop()
+        with self._lock:
+            self.ip, self.port, self.serial = ip, port, serial
+            self.failures = 0
+            self._last_ok = time.monotonic()
+        self._set_state(CONNECTED)
+        # Eventos novos a cada start: uma thread antiga só enxerga os dela
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop, self._wake), name="tv-health", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread = None
+
+    def report(self, ok):
+        if ok:
+            with self._lock:
+                self._last_ok = time.monotonic()
+                recovered = self.failures > 0
+                self.failures = 0
+            if recovered:
+                self._set_state(CONNECTED)
+        else:
+            # Tecla sem resposta: confere já em vez de esperar o próximo ping
+            with self._lock:
+                self.failures = max(self.failures, 1)
+            if self.state == CONNECTED:
+                self._set_state(DEGRADED)
+            if self.state != LOST:  # perdida, quem manda é o backoff
+                self._wake.set()
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        self.state = state
+        if self.on_state:
+            self.on_state(state)
+
+    def _next_delay(self):
+        if not self.failures:
+            return self.interval
+        return min(self.max_interval, self.retry_interval * 2 ** (self.failures - 1))
+
+    def _ping(self):
+        try:
+            res = self.manager.get(self.ip, self.port, "/1/system")
+        except TransportError:
+            return False
+        if res.status_code != 200:
+            return False
+        if self.serial:
+            # Outro aparelho pode ter ganhado o IP da TV
+            try:
+                return res.json().get('serialnumber', self.serial) == self.serial
+            except ValueError:
+                return False
+        return True
+
+    def _run(self, stop, wake):
+        while not stop.is_set():
+            wake.wait(self._next_delay())
+            wake.clear()
+            if stop.is_set():
+                return
+            if not self.failures and time.monotonic() - self._last_ok < self.interval:
+                continue
+            if self._ping():
+                self.report(True)
+                continue
+            with self._lock:
+                self.failures += 1
+                failures = self.failures
+            if failures < self.lost_after:
+                self._set_state(DEGRADED)
+                continue
+            self._set_state(LOST)
+            if self.serial:
+                self._rediscover(stop)
+
+    def _rediscover(self, stop):
+        new_ip = self.find(self.serial, exclude=(self.ip,), tv_port=self.port)
+        if new_ip is None or stop.is_set():
+            return
+        old_ip = self.ip
+        # O nome dado pelo usuário acompanha a TV
+        name = self.registry.get_name(old_ip)
+        if name and not self.registry.get_name(new_ip):
+            self.registry.set_name(new_ip, name)
+        self.ip = new_ip
+        if self.on_moved:
+            self.on_moved(new_ip)
+        self.report(True)
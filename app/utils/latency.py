@@ -0,0 +1,117 @@
+import threading
+
+class HostLatency:
+    __slots__ = ("srtt", "rttvar", "samples", "failures", "last_rtt")
+
+    def __init__(self):
+        self.srtt = None        # RTT suavizado (s)
+        self.rttvar = None      # variação (jitter) suavizada (s)
+        self.samples = 0
+        self.failures = 0       # falhas seguidas
+        self.last_rtt = None
+
+    def add(self, rtt, alpha, beta):
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - beta) * self.rttvar + beta * abs(self.srtt - rtt)
+            self.srtt = (1 - alpha) * self.srtt + alpha * rtt
+        self.samples += 1
+        self.failures = 0
+        self.last_rtt = rtt
+
+class LatencyTracker:
+    """
+    Mede o tempo de resposta de cada TV e deriva timeouts e retentativas.
+
+    Usa as médias móveis do TCP (RFC 6298): RTT suavizado e jitter, com
+    timeout = srtt + 4 * jitter, nunca abaixo de `rtt_margin` vezes o RTT
+    suavizado nem de `min_timeout`, no máximo `max_timeout` e multiplicado
+    por `backoff` a cada falha seguida. Uma TV sem medições usa
+    `initial_timeout`.
+
+    Só entram respostas HTTP completas: o connect TCP é respondido pelo
+    kernel da TV em ~1 ms, bem antes do servidor JointSpace, e derrubaria
+    os timeouts.
+    """
+
+    ALPHA = 1 / 8
+    BETA = 1 / 4
+    K = 4
+
+    def __init__(self, initial_timeout=1.0, min_timeout=0.5, max_timeout=4.0, max_retries=2, backoff=2.0,
+                 rtt_margin=3.0):
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.rtt_margin = rtt_margin
+        self.max_timeout = max_timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._hosts = {}
+        self._network = HostLatency()  # todas as medições juntas
+        self._lock = threading.Lock()
+
+    def record(self, host, rtt):
+        with self._lock:
+            self._hosts.setdefault(host, HostLatency()).add(rtt, self.ALPHA, self.BETA)
+            self._network.add(rtt, self.ALPHA, self.BETA)
+
+    def record_failure(self, host):
+        with self._lock:
+            self._hosts.setdefault(host, HostLatency()).failures += 1
+
+    def _rto(self, stats):
+        if stats.srtt is None:
+            return self.initial_timeout
+        return max(stats.srtt + self.K * stats.rttvar, self.rtt_margin * stats.srtt)
+
+    def timeout(self, host):
+        with self._lock:
+            stats = self._hosts.get(host)
+            # Sem medições da própria TV, o valor fixo de antes (1 s)
+            base = self._rto(stats) if stats is not None else self.initial_timeout
+            failures = stats.failures if stats else 0
+        timeout = max(self.min_timeout, base) * (self.backoff ** min(failures, 4))
+        return min(self.max_timeout, timeout)
+
+    def probe_timeout(self, default=0.5, minimum=0.25):
+        """Timeout do connect na varredura: o dobro do timeout da rede, com piso."""
+        with self._lock:
+            if self._network.srtt is None:
+                return default
+            rto = self._rto(self._network)
+        return min(self.max_timeout, max(minimum, 2 * rto))
+
+    def retry_delays(self, host):
+        """
+        Esperas antes de cada nova tentativa após falha de conexão: a primeira
+        é imediata (em geral só a conexão keep-alive caiu), as demais crescem.
+        """
+        base = self.timeout(host) / 2
+        delays = [0.0] + [min(self.max_timeout, base * self.backoff ** i) for i in range(self.max_retries - 1)]
+        return delays[:self.max_retries]
+
+    def estimates(self, host):
+        """Estado atual de um host, para diagnosticar uma TV lenta."""
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                return None
+            data = {
+                "srtt_ms": stats.srtt * 1000 if stats.srtt is not None else None,
+                "jitter_ms": stats.rttvar * 1000 if stats.rttvar is not None else None,
+                "last_rtt_ms": stats.last_rtt * 1000 if stats.last_rtt is not None else None,
+                "samples": stats.samples,
+                "failures": stats.failures,
+            }
+        data["timeout_ms"] = self.timeout(host) * 1000
+        return data
+
+    def all_estimates(self):
+        with self._lock:
+            hosts = list(self._hosts)
+        return {host: self.estimates(host) for host in hosts}
+
+# Instância global
+latency_tracker = LatencyTracker()
@@ -0,0 +1,27 @@
+import importlib
+import threading
+import types
+
+class _LazyModule(types.ModuleType):
+    """
+    Módulo que só é importado de verdade no primeiro acesso a um atributo.
+    Depois disso os atributos do módulo real são copiados para cá, e os
+    acessos seguintes custam o mesmo que num import comum.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._lazy_lock = threading.Lock()
+
+    def __getattr__(self, attr):
+        if attr.startswith('_lazy'):
+            raise AttributeError(attr)
+        # Duas threads podem chegar juntas no primeiro uso (busca e conexão)
+        with self._lazy_lock:
+            module = importlib.import_module(self.__name__)
+            self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+def lazy_import(name):
+    """`requests = lazy_import("requests")`: adia o custo do import para o primeiro uso."""
+    return _LazyModule(name)
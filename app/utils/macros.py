@@ -0,0 +1,149 @@
+"""
+Macros: sequências nomeadas de teclas, como "Home, CursorDown*3, Confirm".
+
+Cada passo é uma tecla, quantas vezes repeti-la e a espera (s) até o passo
+seguinte. Numa string, `Tecla*N` repete e `Tecla@0.5` muda a espera:
+
+    parse_steps("Home@1.0, CursorDown*3, Confirm")
+
+As macros ficam no tv_registry e rodam como um único comando do
+CommandDispatcher, pela mesma conexão persistente das teclas avulsas.
+"""
+import threading
+import time
+from collections import namedtuple
+
+from app.utils.registry import tv_registry
+
+DEFAULT_DELAY = 0.25
+
+MacroStep = namedtuple('MacroStep', 'key repeat delay')
+
+# Uma linha do rastro de execução; tempos em ms contados do início da macro.
+# `planned` é quando a tecla deveria sair, `started` quando saiu de fato.
+StepTrace = namedtuple('StepTrace', 'index key planned started elapsed ok')
+
+def parse_step(step, default_delay=DEFAULT_DELAY):
+    if isinstance(step, MacroStep):
+        return step
+    if isinstance(step, dict):
+        return MacroStep(step['key'], int(step.get('repeat', 1)), float(step.get('delay', default_delay)))
+    token = step.strip()
+    delay = default_delay
+    repeat = 1
+    try:
+        if '@' in token:
+            token, delay = token.split('@', 1)
+            delay = float(delay)
+        if '*' in token:
+            token, repeat = token.split('*', 1)
+            repeat = int(repeat)
+    except ValueError:
+        raise ValueError(f"Passo de macro inválido: {step!r}") from None
+    key = token.strip()
+    if not key or repeat < 1 or delay < 0:
+        raise ValueError(f"Passo de macro inválido: {step!r}")
+    return MacroStep(key, repeat, delay)
+
+def parse_steps(steps, default_delay=DEFAULT_DELAY):
+    """Lista de MacroStep a partir de uma string separada por vírgulas ou de uma lista."""
+    if isinstance(steps, str):
+        steps = [s for s in steps.split(',') if s.strip()]
+    return [parse_step(s, default_delay) for s in steps]
+
+class MacroRun:
+    """Uma execução de macro, com rastro por tecla e cancelamento."""
+
+    def __init__(self, name, steps, on_step=None, stop_on_error=True):
+        self.name = name
+        self.steps = parse_steps(steps)
+        self.on_step = on_step            # on_step(StepTrace), na thread de envio
+        self.stop_on_error = stop_on_error
+        self.trace = []
+        self.ok = None
+        self._cancelled = threading.Event()
+        self.finished = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def total_keys(self):
+        return sum(step.repeat for step in self.steps)
+
+    def execute(self, send_key):
+        """
+        Envia as teclas em ordem. Cada tecla tem um horário marcado (o início
+        da anterior mais a espera do passo) e nunca sai antes dele nem antes
+        da TV responder à anterior; o atraso em relação ao marcado fica no
+        rastro. Uma tecla recusada interrompe a macro, se `stop_on_error`.
+        """
+        start = time.monotonic()
+        deadline = start
+        ok = True
+        try:
+            index = 0
+            for step in self.steps:
+                for _ in range(step.repeat):
+                    wait = deadline - time.monotonic()
+                    if (wait > 0 and self._cancelled.wait(wait)) or self.cancelled:
+                        ok = False
+                        return
+                    started = time.monotonic()
+                    try:
+                        sent = bool(send_key(step.key))
+                    except Exception:
+                        sent = False
+                    done = time.monotonic()
+                    entry = StepTrace(index, step.key, (deadline - start) * 1000,
+                                      (started - start) * 1000, (done - started) * 1000, sent)
+                    self.trace.append(entry)
+                    if self.on_step:
+                        self.on_step(entry)
+                    index += 1
+                    if not sent:
+                        ok = False
+                        if self.stop_on_error:
+                            return
+                    deadline = started + step.delay
+        finally:
+            self.ok = ok
+            self.finished.set()
+
+    def timing_report(self):
+        """Resumo do rastro: atraso médio/máximo em relação ao horário marcado."""
+        slips = [t.started - t.planned for t in self.trace]
+        return {
+            "keys": len(self.trace),
+            "total_ms": (self.trace[-1].started + self.trace[-1].elapsed) if self.trace else 0.0,
+            "slip_avg_ms": sum(slips) / len(slips) if slips else 0.0,
+            "slip_max_ms": max(slips) if slips else 0.0,
+        }
+
+class MacroStore:
+    """Macros salvas no tv_registry, no formato [{key, repeat, delay}]."""
+
+    def __init__(self, registry=tv_registry):
+        self.registry = registry
+
+    def names(self):
+        return sorted(self.registry.get_macros())
+
+    def get(self, name):
+        steps = self.registry.get_macros().get(name)
+        return parse_steps(steps) if steps is not None else None
+
+    def save(self, name, steps):
+        steps = parse_steps(steps)
+        self.registry.set_macro(name, [step._asdict() for step in steps])
+        return steps
+
+    def delete(self, name):
+        self.registry.delete_macro(name)
+
+# Instância global
+macro_store = MacroStore()
@@ -1,10 +1,20 @@
+import asyncio
 import socket
-import requests
+import sys
+import threading
+import time
+from collections import namedtuple
 import json
-import os
+from app.utils.registry import tv_registry
+from app.utils.latency import latency_tracker
+from app.utils.perf import perf
+from app.utils.lazy import lazy_import
+from app.utils.transport import KEY_PATH, TransportConnectionError, TransportError, transport_factory
 
-# Caminho para salvar nomes personalizados das TVs
-DATA_FILE = "tv_data.json"
+# requests só é usado pela busca antiga (scan_single_ip) e pelo transporte
+# alternativo; o import (~80 ms num PC, bem mais no celular) fica para o
+# primeiro uso e nem acontece no caminho normal.
+requests = lazy_import("requests")
 
 def get_local_ip_address():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -17,14 +27,21 @@ def get_local_ip_address():
         s.close()
     return IP
 
-def scan_single_ip(ip_address, tv_port=1925, timeout=1):
+def subnet_hosts(local_ip):
+    """Os 254 endereços da /24 do IP local."""
+    prefix = ".".join(local_ip.split('.')[:3]) + "."
+    return [f"{prefix}{i}" for i in range(1, 255)]
+
+def scan_single_ip(ip_address, tv_port=1925, timeout=None):
     url = f"http://{ip_address}:{tv_port}/1/system"
     try:
-        response = requests.get(url, timeout=timeout)
+        response = requests.get(url, timeout=timeout or latency_tracker.timeout(ip_address))
+        latency_tracker.record(ip_address, response.elapsed.total_seconds())
         if response.status_code == 200:
             try:
                 data = response.json()
                 name = data.get('name', ip_address)
+                tv_registry.mark_seen(ip_address, tv_port, data.get('model'), data.get('serialnumber'))
                 # Verifica se temos um nome personalizado salvo
                 custom_name = get_custom_name(ip_address)
                 return (ip_address, custom_name if custom_name else name)
@@ -34,52 +51,438 @@ def scan_single_ip(ip_address, tv_port=1925, timeout=1):
         pass
     return None
 
-def send_tv_command(ip, port, cmd):
+# --- Busca assíncrona ---
+# Em vez de um GET bloqueante por IP (uma thread por host), a varredura faz
+# primeiro um connect TCP não bloqueante na porta da TV e só chama
+# /1/system nos hosts que aceitaram a conexão.
+
+async def _probe_port(ip_address, tv_port, timeout):
     try:
-        url = f"http://{ip}:{port}/1/input/key"
-        requests.post(url, json={'key': cmd}, timeout=1)
-        return True
-    except:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip_address, tv_port), timeout)
+    except (OSError, asyncio.TimeoutError):
         return False
+    # O tempo do connect não vai para o LatencyTracker: quem responde é o
+    # kernel da TV, muito antes do servidor HTTP
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
 
-def send_tv_text(ip, port, text):
+async def _async_get(ip_address, tv_port, path, timeout):
+    """GET HTTP/1.0 mínimo sobre asyncio streams. Retorna (status, corpo)."""
+    async def _request():
+        reader, writer = await asyncio.open_connection(ip_address, tv_port)
+        try:
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: {ip_address}:{tv_port}\r\n\r\n".encode('ascii'))
+            await writer.drain()
+            raw = await reader.read()
+        finally:
+            writer.close()
+        head, _, body = raw.partition(b"\r\n\r\n")
+        return int(head.split(b" ", 2)[1]), body
+    return await asyncio.wait_for(_request(), timeout)
+
+async def async_check_tv(ip_address, tv_port=1925, probe_timeout=None, timeout=None):
     """
-    Envia texto para a TV. Tenta o endpoint de texto e, se falhar, 
-    pode ser expandido para outros métodos.
+    Nome da TV em `ip_address`, ou None se o host não for uma TV. Sem
+    timeouts explícitos, usa os do LatencyTracker (medidos na própria rede).
     """
+    if not await _probe_port(ip_address, tv_port, probe_timeout or latency_tracker.probe_timeout()):
+        return None
+    start = time.perf_counter()
     try:
-        # Tenta o endpoint de texto do JointSpace (comum em modelos mais novos)
-        url = f"http://{ip}:{port}/1/input/text"
-        res = requests.post(url, json={'text': text}, timeout=1)
-        if res.status_code == 200:
-            return True
-        
-        # Se falhar, tenta enviar como tecla individual (fallback)
-        # Nota: Algumas TVs aceitam o caractere diretamente no campo 'key'
-        url_key = f"http://{ip}:{port}/1/input/key"
-        requests.post(url_key, json={'key': text}, timeout=1)
-        return True
+        status, body = await _async_get(ip_address, tv_port, "/1/system", timeout or latency_tracker.timeout(ip_address))
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError):
+        return None
+    latency_tracker.record(ip_address, time.perf_counter() - start)
+    if status != 200:
+        return None
+    try:
+        data = json.loads(body.decode('utf-8'))
+        name = data.get('name', ip_address)
+    except (ValueError, AttributeError):
+        return ip_address
+    tv_registry.mark_seen(ip_address, tv_port, data.get('model'), data.get('serialnumber'))
+    custom_name = get_custom_name(ip_address)
+    return custom_name if custom_name else name
+
+async def cancel_and_wait(tasks, interval=0.1):
+    """
+    Cancela `tasks` e espera todas terminarem. No Python 3.11 o wait_for
+    pode engolir um cancel() que chega junto com o fim da operação, então o
+    cancelamento é repetido até não sobrar nenhuma.
+    """
+    pending = [task for task in tasks if not task.done()]
+    while pending:
+        for task in pending:
+            task.cancel()
+        _, pending = await asyncio.wait(pending, timeout=interval)
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+async def async_scan(hosts, tv_port=1925, concurrency=64, probe_timeout=None, timeout=None):
+    """
+    Varre `hosts` e devolve (ip, nome) à medida que cada host termina.
+    `nome` é None quando o host não é uma TV. No máximo `concurrency`
+    conexões ficam abertas ao mesmo tempo.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def check(ip_address):
+        async with semaphore:
+            return ip_address, await async_check_tv(ip_address, tv_port, probe_timeout, timeout)
+
+    tasks = [asyncio.ensure_future(check(ip)) for ip in hosts]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        await cancel_and_wait(tasks)
+
+# Eventos da varredura:
+#   found    -> ip, name          (uma TV respondeu)
+#   progress -> done, total       (mais um host verificado)
+#   done     -> done, total       (fim; sempre o último evento)
+ScanEvent = namedtuple('ScanEvent', 'kind ip name done total')
+
+async def scan_events(hosts, **kwargs):
+    """Varredura como fluxo de ScanEvent, sem nenhuma dependência do Kivy."""
+    hosts = list(hosts)
+    total = len(hosts)
+    done = 0
+    results = async_scan(hosts, **kwargs)
+    try:
+        async for ip_address, name in results:
+            done += 1
+            if name:
+                yield ScanEvent('found', ip_address, name, done, total)
+            yield ScanEvent('progress', ip_address, None, done, total)
+    finally:
+        # Fecha a varredura (e cancela as conexões) mesmo se o consumidor parar antes
+        await results.aclose()
+    yield ScanEvent('done', None, None, done, total)
+
+class AsyncEventIterator:
+    """
+    Consome um gerador assíncrono de eventos como um iterador comum, rodando
+    o loop asyncio na thread que itera; útil para a interface, a linha de
+    comando e testes. `close()` cancela o trabalho pendente e pode ser
+    chamado de outra thread (ex.: a da interface) enquanto a que itera
+    espera o próximo evento: a espera é cancelada na hora, sem aguardar
+    mais um evento, e a limpeza fica com a thread que itera.
+    """
+
+    def __init__(self, events):
+        self._events = events
+        self._loop = asyncio.new_event_loop()
+        self._lock = threading.Lock()
+        self._owner = None        # thread que itera
+        self._pending = None      # tarefa esperando o próximo evento
+        self._closed = False
+        self._finished = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        with self._lock:
+            if self._owner is None:
+                self._owner = threading.get_ident()
+            if self._closed or self._finished:
+                closed = True
+            else:
+                closed = False
+                self._pending = self._loop.create_task(self._events.__anext__())
+        if closed:
+            self._finish()
+            raise StopIteration
+        try:
+            return self._loop.run_until_complete(self._pending)
+        except (StopAsyncIteration, asyncio.CancelledError):
+            self._finish()
+            raise StopIteration from None
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            pending = self._pending
+            other_thread = self._owner not in (None, threading.get_ident())
+        if other_thread:
+            if pending is not None:
+                try:
+                    self._loop.call_soon_threadsafe(pending.cancel)
+                except RuntimeError:
+                    pass   # a thread que itera já terminou e fechou o loop
+            return
+        self._finish()
+
+    def _finish(self):
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+        loop = self._loop
+        loop.run_until_complete(self._events.aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+    def __del__(self):
+        # Abandonado sem close() (ex.: `break` no meio): fecha como o gerador fecharia
+        if not self._finished and self._pending is None:
+            try:
+                self._finish()
+            except Exception:
+                pass
+
+def iter_async_events(events):
+    """Iterador síncrono (AsyncEventIterator) sobre o gerador assíncrono `events`."""
+    return AsyncEventIterator(events)
+
+def iter_scan_events(hosts, **kwargs):
+    """Versão síncrona de `scan_events`."""
+    return iter_async_events(scan_events(hosts, **kwargs))
+
+def scan_hosts(hosts, on_found, on_progress=None, **kwargs):
+    """
+    Executa a varredura até o fim na thread atual (bloqueante).
+    `on_found(ip, nome)` é chamado para cada TV e `on_progress(feitos)`
+    para cada host verificado.
+    """
+    for event in iter_scan_events(hosts, **kwargs):
+        if event.kind == 'found':
+            on_found(event.ip, event.name)
+        elif event.kind == 'progress' and on_progress:
+            on_progress(event.done)
+
+# --- Conexões persistentes ---
+# Cada TV ganha um transporte próprio com keep-alive (app.utils.transport),
+# então um toque no controle custa só o round trip HTTP, sem handshake TCP
+# novo. O padrão fala HTTP direto no socket; AOC_TRANSPORT=requests volta
+# para requests.Session.
+
+class TvConnectionManager:
+    def __init__(self, pool_size=2, idle_timeout=30, latency=latency_tracker, transport=None):
+        self.pool_size = pool_size            # conexões keep-alive por TV
+        self.idle_timeout = idle_timeout      # segundos sem uso até fechar as conexões
+        self.latency = latency                # timeouts e retentativas por TV
+        self.transport_class = transport or transport_factory()
+        self._transports = {}                 # (ip, porta) -> [transporte, último uso]
+        self._lock = threading.Lock()
+
+    def _evict_idle(self, now):
+        for key, (transport, last_used) in list(self._transports.items()):
+            if now - last_used > self.idle_timeout:
+                transport.close()
+                del self._transports[key]
+
+    def transport(self, ip, port):
+        now = time.monotonic()
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._transports.get((ip, port))
+            if entry is None:
+                entry = self._transports[(ip, port)] = [self.transport_class(ip, port, self.pool_size), now]
+            entry[1] = now
+            return entry[0]
+
+    def _call(self, ip, port, path, send, timeout=None):
+        """
+        Sem `timeout`, usa o timeout medido para a TV. Falhas de conexão são
+        repetidas com as esperas de `latency.retry_delays`.
+        """
+        delays = self.latency.retry_delays(ip)
+        for attempt in range(len(delays) + 1):
+            transport = self.transport(ip, port)
+            start = time.perf_counter()
+            try:
+                response = send(transport, timeout or self.latency.timeout(ip))
+            except TransportConnectionError:
+                # A TV fechou a conexão keep-alive (standby, troca de rede...):
+                # descarta o transporte e tenta de novo com uma conexão nova.
+                # Timeouts de leitura não são repetidos para não duplicar teclas.
+                self.latency.record_failure(ip)
+                self.close(ip, port)
+                if attempt == len(delays):
+                    perf.count("net.errors")
+                    raise
+                perf.count("net.retries")
+                time.sleep(delays[attempt])
+            except TransportError:
+                self.latency.record_failure(ip)
+                perf.count("net.errors")
+                raise
+            else:
+                elapsed = time.perf_counter() - start
+                self.latency.record(ip, elapsed)
+                perf.record("net." + path, elapsed * 1000)
+                return response
+
+    def request(self, method, ip, port, path, timeout=None, json=None, headers=None):
+        return self._call(ip, port, path, lambda t, to: t.request(method, path, to, json=json, headers=headers), timeout)
+
+    def get(self, ip, port, path, **kwargs):
+        return self.request("GET", ip, port, path, **kwargs)
+
+    def post(self, ip, port, path, **kwargs):
+        return self.request("POST", ip, port, path, **kwargs)
+
+    def post_key(self, ip, port, key, timeout=None):
+        """POST /1/input/key; o transporte reaproveita o pedido já montado da tecla."""
+        return self._call(ip, port, KEY_PATH, lambda t, to: t.post_key(key, to), timeout)
+
+    def close(self, ip, port):
+        with self._lock:
+            entry = self._transports.pop((ip, port), None)
+        if entry:
+            entry[0].close()
+
+    def close_all(self):
+        with self._lock:
+            transports, self._transports = self._transports, {}
+        for transport, _ in transports.values():
+            transport.close()
+
+# Instância global
+connection_manager = TvConnectionManager()
+
+def post_tv_key(ip, port, cmd):
+    """Envia a tecla e devolve o status HTTP (exceções de rede sobem)."""
+    return connection_manager.post_key(ip, port, cmd).status_code
+
+def send_tv_command(ip, port, cmd):
+    try:
+        return post_tv_key(ip, port, cmd) == 200
     except:
         return False
 
-def save_custom_name(ip, name):
-    data = {}
-    if os.path.exists(DATA_FILE):
+# --- Entrada de texto ---
+# Status que indicam que a TV não tem o endpoint /1/input/text
+TEXT_UNSUPPORTED_STATUS = (400, 404, 405, 501)
+
+class TextEntry:
+    """Um texto a digitar na TV, com progresso e cancelamento."""
+
+    def __init__(self, text, on_progress=None):
+        self.text = text
+        self.on_progress = on_progress    # on_progress(enviados, total)
+        self.sent = 0
+        self.ok = None
+        self.error = None                 # motivo da falha, quando se sabe
+        self._cancelled = threading.Event()
+        self.finished = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def _progress(self, sent):
+        self.sent = sent
+        if self.on_progress:
+            self.on_progress(sent, len(self.text))
+
+# O JointSpace só aceita teclas com nome: sem /1/input/text, só dígitos e
+# ponto têm tecla própria (letras e espaço não)
+TEXT_KEYS = dict({str(d): f"Digit{d}" for d in range(10)}, **{".": "Dot"})
+
+def char_to_key(ch):
+    """Tecla JointSpace para um caractere, ou None se não houver."""
+    return TEXT_KEYS.get(ch)
+
+class TextInputPipeline:
+    """
+    Digita texto na TV pela conexão persistente.
+
+    Lembra por TV (no tv_registry, campo text_endpoint) se /1/input/text
+    funciona. Se não funcionar, manda uma tecla por caractere, em ordem, com
+    no mínimo `key_interval` segundos entre elas para a TV não perder teclas;
+    nesse caminho só dígitos e ponto, e um texto com outros caracteres é
+    recusado antes de enviar qualquer tecla (motivo em `entry.error`).
+    Deve rodar numa thread de trabalho (ex.: a do CommandDispatcher).
+    """
+
+    def __init__(self, manager=connection_manager, registry=tv_registry, key_interval=0.03):
+        self.manager = manager
+        self.registry = registry
+        self.key_interval = key_interval
+
+    def supports_text(self, ip):
+        entry = self.registry.get(ip)
+        return entry.get("text_endpoint") if entry else None
+
+    def send(self, ip, port, entry):
         try:
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-        except: pass
-    data[ip] = name
-    try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f)
-    except: pass
+            entry.ok = self._send(ip, port, entry)
+        except TransportError:
+            entry.ok = False
+        entry.finished.set()
+        return entry.ok
+
+    def _send(self, ip, port, entry):
+        if not entry.text or entry.cancelled:
+            return not entry.text
+        if self.supports_text(ip) is not False:
+            res = self.manager.post(ip, port, "/1/input/text", json={'text': entry.text})
+            if res.status_code == 200:
+                self.registry.update(ip, text_endpoint=True)
+                entry._progress(len(entry.text))
+                return True
+            if res.status_code not in TEXT_UNSUPPORTED_STATUS:
+                return False
+            self.registry.update(ip, text_endpoint=False)
+        return self._send_keys(ip, port, entry)
+
+    def _send_keys(self, ip, port, entry):
+        keys = [char_to_key(ch) for ch in entry.text]
+        if None in keys:
+            invalid = "".join(sorted({ch for ch, key in zip(entry.text, keys) if key is None}))
+            entry.error = f"TV sem entrada de texto: só dígitos e ponto podem ser digitados (recusado: {invalid!r})"
+            return False
+        next_at = time.monotonic()
+        for sent, key in enumerate(keys):
+            if entry.cancelled:
+                return False
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            res = self.manager.post_key(ip, port, key)
+            if res.status_code != 200:
+                entry.error = f"HTTP {res.status_code} na tecla {key}"
+                return False
+            entry._progress(sent + 1)
+            next_at = max(next_at, time.monotonic()) + self.key_interval
+        return True
+
+# Instância global
+text_pipeline = TextInputPipeline()
+
+def send_tv_text(ip, port, text):
+    """
+    Envia texto para a TV: pelo endpoint de texto do JointSpace quando a TV
+    o suporta, senão uma tecla por caractere (veja TextInputPipeline).
+    """
+    entry = text if isinstance(text, TextEntry) else TextEntry(text)
+    return text_pipeline.send(ip, port, entry)
+
+def save_custom_name(ip, name):
+    tv_registry.set_name(ip, name)
 
 def get_custom_name(ip):
-    if os.path.exists(DATA_FILE):
-        try:
-            with open(DATA_FILE, 'r') as f:
-                data = json.load(f)
-                return data.get(ip)
-        except: pass
-    return None
+    return tv_registry.get_name(ip)
+
+if __name__ == '__main__':
+    # Varredura pela linha de comando: python -m app.utils.network [192.168.1.]
+    prefix = sys.argv[1] if len(sys.argv) > 1 else None
+    hosts = subnet_hosts(prefix + "1" if prefix else get_local_ip_address())
+    for event in iter_scan_events(hosts):
+        if event.kind == 'found':
+            print(f"{event.name} ({event.ip})")
+        elif event.kind == 'done':
+            print(f"{event.done}/{event.total} hosts verificados")
@@ -0,0 +1,140 @@
+"""
+Instrumentação dos caminhos quentes (rede, montagem de telas, catálogo,
+busca), para ver no próprio celular para onde vai o tempo.
+
+    with perf.timer("net.request"):
+        ...
+    perf.count("net.retries")
+
+Desligada (o padrão), `timer` devolve um objeto nulo compartilhado e
+`count`/`record` retornam na primeira linha. Liga com AOC_PERF=1 no
+ambiente ou pelo painel de desempenho do app.
+"""
+import json
+import os
+import threading
+import time
+
+# Limites superiores (ms) das faixas dos histogramas
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf'))
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class _Timer:
+    __slots__ = ("recorder", "name", "start")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.recorder.record(self.name, (time.perf_counter() - self.start) * 1000)
+        return False
+
+class Histogram:
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * len(BUCKETS_MS)
+
+    def add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.min = ms if self.min is None else min(self.min, ms)
+        self.max = ms if self.max is None else max(self.max, ms)
+        for i, limit in enumerate(BUCKETS_MS):
+            if ms <= limit:
+                self.buckets[i] += 1
+                break
+
+    def percentile(self, pct):
+        """Limite superior da faixa onde cai o percentil (o máximo, na última faixa)."""
+        if not self.count:
+            return None
+        target = self.count * pct / 100.0
+        seen = 0
+        for limit, n in zip(BUCKETS_MS, self.buckets):
+            seen += n
+            if seen >= target:
+                return min(limit, self.max)
+        return self.max
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "avg_ms": self.total / self.count if self.count else None,
+            "min_ms": self.min,
+            "max_ms": self.max,
+            "p50_ms": self.percentile(50),
+            "p99_ms": self.percentile(99),
+            "buckets": {("inf" if limit == float('inf') else str(limit)): n
+                        for limit, n in zip(BUCKETS_MS, self.buckets) if n},
+        }
+
+class PerfRecorder:
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._started = time.time()
+
+    def timer(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name)
+
+    def record(self, name, ms):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(ms)
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._counters = {}
+            self._started = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "since": self._started,
+                "timers": {name: h.as_dict() for name, h in sorted(self._histograms.items())},
+                "counters": dict(sorted(self._counters.items())),
+            }
+
+    def dump(self, path):
+        """Grava o snapshot em JSON e devolve o caminho."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        return path
+
+# Instância global
+perf = PerfRecorder(enabled=os.environ.get("AOC_PERF") == "1")
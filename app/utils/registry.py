@@ -0,0 +1,168 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+# Caminho para salvar nomes personalizados e dados das TVs
+DATA_FILE = "tv_data.json"
+
+class TvRegistry:
+    """
+    Cadastro das TVs conhecidas, mantido em memória.
+
+    O arquivo é lido uma única vez; as gravações são agrupadas (`save_delay`
+    segundos após a última alteração, por uma única thread que dorme até
+    haver alteração pendente) e feitas de forma atômica, gravando
+    num arquivo temporário e renomeando por cima do original. Todas as
+    operações são protegidas por lock, pois a busca consulta o cadastro de
+    várias tarefas ao mesmo tempo; a escrita no disco acontece fora dele.
+
+    Cada TV é guardada pelo IP com os campos opcionais: name (nome dado pelo
+    usuário), last_seen (timestamp), port, model e serial (de /1/system). Dados
+    comuns a todas as TVs de um modelo (ex.: capacidades) ficam em `models`
+    e as macros do usuário (nome -> passos) em `macros`.
+    """
+
+    def __init__(self, path=DATA_FILE, save_delay=1.0):
+        self.path = path
+        self.save_delay = save_delay
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()   # uma gravação em disco por vez
+        self._tvs = None
+        self._models = {}
+        self._macros = {}
+        self._dirty = threading.Event()   # há alteração ainda não gravada
+        self._last_change = 0.0
+        self._saver = None
+
+    def _load(self):
+        if self._tvs is not None:
+            return self._tvs
+        raw = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+            except (OSError, ValueError):
+                raw = {}
+        if isinstance(raw, dict) and isinstance(raw.get("tvs"), dict):
+            self._tvs = raw["tvs"]
+            if isinstance(raw.get("models"), dict):
+                self._models = raw["models"]
+            if isinstance(raw.get("macros"), dict):
+                self._macros = raw["macros"]
+        else:
+            # Formato antigo: {"ip": "nome"} (qualquer outra coisa é ignorada)
+            items = raw.items() if isinstance(raw, dict) else ()
+            self._tvs = {ip: {"name": name} for ip, name in items if isinstance(name, str)}
+        return self._tvs
+
+    def get(self, ip):
+        with self._lock:
+            entry = self._load().get(ip)
+            return dict(entry) if entry else None
+
+    def get_name(self, ip):
+        with self._lock:
+            return self._load().get(ip, {}).get("name")
+
+    def all(self):
+        with self._lock:
+            return {ip: dict(entry) for ip, entry in self._load().items()}
+
+    def update(self, ip, **fields):
+        with self._lock:
+            self._load().setdefault(ip, {}).update(fields)
+            self._schedule_save()
+
+    def get_model(self, model):
+        with self._lock:
+            self._load()
+            entry = self._models.get(model)
+            return dict(entry) if entry else None
+
+    def set_model(self, model, data):
+        with self._lock:
+            self._load()
+            self._models[model] = dict(data)
+            self._schedule_save()
+
+    def get_macros(self):
+        with self._lock:
+            self._load()
+            return {name: list(steps) for name, steps in self._macros.items()}
+
+    def set_macro(self, name, steps):
+        with self._lock:
+            self._load()
+            self._macros[name] = list(steps)
+            self._schedule_save()
+
+    def delete_macro(self, name):
+        with self._lock:
+            self._load()
+            if self._macros.pop(name, None) is not None:
+                self._schedule_save()
+
+    def set_name(self, ip, name):
+        self.update(ip, name=name)
+
+    def mark_seen(self, ip, port=None, model=None, serial=None):
+        fields = {"last_seen": time.time()}
+        if port is not None:
+            fields["port"] = port
+        if model:
+            fields["model"] = model
+        if serial:
+            fields["serial"] = serial
+        self.update(ip, **fields)
+
+    def _schedule_save(self):
+        # Chamado com o lock: só marca a alteração; quem grava é o _save_loop
+        self._last_change = time.monotonic()
+        self._dirty.set()
+        if self._saver is None:
+            self._saver = threading.Thread(target=self._save_loop, name="tv-registry-save", daemon=True)
+            self._saver.start()
+
+    def _save_loop(self):
+        while True:
+            self._dirty.wait()
+            # Espera `save_delay` sem alterações (cada update adia a gravação)
+            while True:
+                with self._lock:
+                    wait = self._last_change + self.save_delay - time.monotonic()
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+            if self._dirty.is_set():   # um flush() explícito pode já ter gravado
+                self.flush()
+
+    def flush(self):
+        # Copia os dados com o lock e grava sem ele: a busca e o loop de
+        # eventos não esperam o disco. `_write_lock` só ordena as gravações.
+        with self._write_lock:
+            with self._lock:
+                self._dirty.clear()
+                if self._tvs is None:
+                    return
+                payload = json.dumps({"version": 2, "tvs": self._tvs, "models": self._models, "macros": self._macros})
+                path = self.path
+            directory = os.path.dirname(os.path.abspath(path))
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tv_data.", suffix=".tmp")
+            except OSError as e:
+                print(f"Erro ao salvar dados das TVs: {e}")
+                return
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Erro ao salvar dados das TVs: {e}")
+                try: os.remove(tmp_path)
+                except OSError: pass
+
+# Instância global
+tv_registry = TvRegistry()
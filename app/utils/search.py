@@ -0,0 +1,253 @@
+import heapq
+import threading
+import time
+import unicodedata
+from collections import Counter, deque
+
+def normalize(text):
+    """Minúsculas, sem acentos e com pontuação/hífens trocados por espaço."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch if ch.isalnum() else ' ' for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.casefold().split())
+
+def _within_one_edit(a, b):
+    """True se `a` e `b` diferem por no máximo uma edição (inclui transposição)."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la > lb:
+        a, b, la, lb = b, a, lb, la
+    i = 0
+    while i < la and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        if a[i + 1:] == b[i + 1:]:
+            return True
+        return i + 1 < la and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]
+    return a[i:] == b[i + 1:]
+
+class CategoryIndex:
+    """
+    Índice de busca das categorias Netflix.
+
+    Guarda os nomes normalizados (sem acento, minúsculos) e um índice de
+    n-gramas (1 a 3 caracteres) para achar candidatos sem percorrer a lista
+    toda. Quando a nova busca só acrescenta letras à anterior, o resultado é
+    refinado a partir dos candidatos anteriores. Se nada bater, termos com 4+
+    letras aceitam um erro de digitação contra as palavras do catálogo.
+    """
+
+    GRAM = 3
+    # Versão do formato de to_data()/from_data(): muda junto com o que vai
+    # nos dados ou com normalize(), para catálogos compilados antes serem recusados
+    DATA_VERSION = 1
+    FUZZY_MIN_LEN = 4
+    # Acima deste tamanho sai mais barato consultar o índice do que refinar
+    # o resultado anterior item por item
+    NARROW_MAX = 2000
+
+    def __init__(self, items):
+        self.items = list(items)
+        self._names = [normalize(item['name']) for item in self.items]
+        self._grams = {}
+        self._words = {}
+        for idx, name in enumerate(self._names):
+            for n in range(1, self.GRAM + 1):
+                for pos in range(len(name) - n + 1):
+                    self._grams.setdefault(name[pos:pos + n], set()).add(idx)
+            for word in name.split():
+                self._words.setdefault(word, set()).add(idx)
+        self._finish()
+
+    def _finish(self):
+        # Desempate do ranking: nomes mais curtos primeiro, depois a ordem original
+        order = sorted(range(len(self._names)), key=lambda i: (len(self._names[i]), i))
+        self._pos = [0] * len(order)
+        for rank, idx in enumerate(order):
+            self._pos[idx] = rank
+        # (consulta, ids) da última busca; uma tupla só para que buscas em
+        # threads diferentes nunca vejam consulta e ids de buscas distintas
+        self._last = None
+
+    def to_data(self):
+        """Índice como dados simples (listas e dicts), para o catálogo compilado."""
+        return {
+            'version': self.DATA_VERSION,
+            'gram': self.GRAM,
+            'items': self.items,
+            'names': self._names,
+            'grams': {gram: sorted(ids) for gram, ids in self._grams.items()},
+            'words': {word: sorted(ids) for word, ids in self._words.items()},
+        }
+
+    @classmethod
+    def from_data(cls, data):
+        """Remonta o índice de `to_data()` sem normalizar nem recortar os nomes de novo."""
+        if data.get('version') != cls.DATA_VERSION or data.get('gram') != cls.GRAM:
+            raise ValueError("índice de outra versão")
+        index = cls.__new__(cls)
+        index.items = list(data['items'])
+        index._names = list(data['names'])
+        if len(index._names) != len(index.items):
+            raise ValueError("índice inconsistente")
+        index._grams = {gram: set(ids) for gram, ids in data['grams'].items()}
+        index._words = {word: set(ids) for word, ids in data['words'].items()}
+        index._finish()
+        return index
+
+    def __len__(self):
+        return len(self.items)
+
+    def _candidates(self, term):
+        if len(term) <= self.GRAM:
+            return set(self._grams.get(term, ()))
+        postings = []
+        for pos in range(len(term) - self.GRAM + 1):
+            ids = self._grams.get(term[pos:pos + self.GRAM])
+            if not ids:
+                return set()
+            postings.append(ids)
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+        return result
+
+    def _fuzzy_candidates(self, term):
+        result = set()
+        for word, ids in self._words.items():
+            if len(word) < len(term) - 1:
+                continue
+            # Compara também com o começo da palavra, pois a busca ainda pode
+            # estar sendo digitada ("thriler" -> "thrillers")
+            if any(_within_one_edit(term, word[:n]) for n in (len(term) - 1, len(term), len(term) + 1)):
+                result |= ids
+        return result
+
+    def _rank(self, ids, terms, limit):
+        # Pontuação por termo: palavra exata > começo de palavra > meio do texto.
+        # Como todo id já contém todos os termos, basta contar os bônus.
+        ids = ids if isinstance(ids, set) else set(ids)
+        bonus = Counter()
+        for term in terms:
+            exact = self._words.get(term)
+            if exact:
+                bonus.update(exact & ids)
+            for word, word_ids in self._words.items():
+                if word.startswith(term):
+                    bonus.update(word_ids & ids)
+        pos = self._pos
+        if limit and len(ids) > limit:
+            ranked = heapq.nsmallest(limit, bonus, key=lambda i: (-bonus[i], pos[i]))
+            if len(ranked) < limit:
+                ranked += heapq.nsmallest(limit - len(ranked), ids - bonus.keys(), key=pos.__getitem__)
+            return ranked
+        return sorted(ids, key=lambda i: (-bonus[i], pos[i]))
+
+    def search(self, query, limit=None):
+        """Retorna os itens que contêm todos os termos, do mais relevante ao menos."""
+        norm = normalize(query)
+        terms = norm.split()
+        if not terms:
+            self._last = None
+            return self.items[:limit] if limit else list(self.items)
+
+        long_terms = [t for t in terms if len(t) > self.GRAM]
+        last = self._last
+        if last is not None and norm.startswith(last[0]) and len(last[1]) <= self.NARROW_MAX:
+            # Busca incremental: cada termo anterior está contido em algum
+            # termo novo, então o resultado só pode encolher.
+            ids = {i for i in last[1] if all(t in self._names[i] for t in terms)}
+        else:
+            terms_by_size = sorted(terms, key=len, reverse=True)
+            ids = self._candidates(terms_by_size[0])
+            for term in terms_by_size[1:]:
+                if not ids:
+                    break
+                ids &= self._candidates(term)
+            # Termos com até GRAM letras já são exatos no índice de n-gramas
+            if long_terms:
+                ids = {i for i in ids if all(t in self._names[i] for t in long_terms)}
+
+        if ids:
+            self._last = (norm, ids)
+        else:
+            self._last = None
+            ids = self._fuzzy_search(terms)
+
+        return [self.items[i] for i in self._rank(ids, terms, limit)]
+
+    def _fuzzy_search(self, terms):
+        ids = None
+        for term in terms:
+            matches = self._candidates(term)
+            if len(term) > self.GRAM:
+                matches = {i for i in matches if term in self._names[i]}
+            if not matches and len(term) >= self.FUZZY_MIN_LEN:
+                matches = self._fuzzy_candidates(term)
+            ids = matches if ids is None else ids & matches
+            if not ids:
+                return set()
+        return ids
+
+class SearchWorker:
+    """
+    Avalia buscas do CategoryIndex numa thread própria.
+
+    Só a consulta mais recente importa: uma consulta nova descarta a que
+    ainda não começou, e um resultado que fica pronto depois de outra
+    consulta ter chegado é jogado fora. `on_result(geração, itens, ms)` é
+    chamado na thread do worker; `geração` é o número devolvido por submit.
+    Com `limit`, só os `limit` itens mais relevantes de cada busca.
+    """
+
+    def __init__(self, index, on_result, slow_query_ms=50, history=50, limit=None):
+        self.index = index
+        self.on_result = on_result
+        self.limit = limit
+        self.slow_query_ms = slow_query_ms
+        self.timings = deque(maxlen=history)        # (consulta, ms) das últimas buscas
+        self.slow_queries = deque(maxlen=history)   # só as que passaram de slow_query_ms
+        self._cond = threading.Condition()
+        self._pending = None
+        self._generation = 0
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="category-search", daemon=True)
+        self._thread.start()
+
+    def submit(self, query):
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, query)
+            self._cond.notify()
+            return self._generation
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._generation += 1
+            self._pending = None
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                generation, query = self._pending
+                self._pending = None
+            start = time.perf_counter()
+            results = self.index.search(query, limit=self.limit)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.timings.append((query, elapsed_ms))
+            if elapsed_ms >= self.slow_query_ms:
+                self.slow_queries.append((query, elapsed_ms))
+            if self.is_current(generation):
+                self.on_result(generation, results, elapsed_ms)
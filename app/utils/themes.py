@@ -1,6 +1,44 @@
+import json
+import os
 from kivy.event import EventDispatcher
 from kivy.properties import ListProperty, StringProperty
 
+THEMES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'assets', 'themes.json')
+
+# Chave no arquivo de temas -> propriedade do ThemeManager
+THEME_PROPERTIES = {
+    "bg": "bg_color",
+    "primary": "primary_color",
+    "accent": "accent_color",
+    "text": "text_color",
+    "display_bg": "display_bg",
+    "display_text": "display_text",
+}
+DEFAULT_TEXT_COLOR = [1, 1, 1, 1]
+
+# Usado só se o arquivo de temas não puder ser lido
+FALLBACK_THEMES = {
+    "Escuro": {
+        "bg": [0.05, 0.05, 0.05, 1],
+        "primary": [0.2, 0.6, 1, 1],
+        "accent": [0.8, 0.2, 0.2, 1],
+        "display_bg": [0.1, 0.2, 0.1, 1],
+        "display_text": [0, 1, 0, 1]
+    }
+}
+
+def load_themes(path=THEMES_FILE):
+    """Lê os temas do JSON, ignorando os que não têm todas as cores obrigatórias."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao carregar temas: {e}")
+        return dict(FALLBACK_THEMES)
+    required = set(THEME_PROPERTIES) - {"text"}
+    themes = {name: t for name, t in data.items() if isinstance(t, dict) and required <= set(t)}
+    return themes or dict(FALLBACK_THEMES)
+
 class ThemeManager(EventDispatcher):
     bg_color = ListProperty([0.05, 0.05, 0.05, 1])
     primary_color = ListProperty([0.2, 0.6, 1, 1])
@@ -10,41 +48,44 @@ class ThemeManager(EventDispatcher):
     display_text = ListProperty([0, 1, 0, 1])
     theme_name = StringProperty("Escuro")
 
-    themes = {
-        "Escuro": {
-            "bg": [0.05, 0.05, 0.05, 1],
-            "primary": [0.2, 0.6, 1, 1],
-            "accent": [0.8, 0.2, 0.2, 1],
-            "display_bg": [0.1, 0.2, 0.1, 1],
-            "display_text": [0, 1, 0, 1]
-        },
-        "Azul Oceano": {
-            "bg": [0, 0.1, 0.2, 1],
-            "primary": [0, 0.5, 0.8, 1],
-            "accent": [1, 0.4, 0, 1],
-            "display_bg": [0, 0.2, 0.3, 1],
-            "display_text": [0.5, 1, 1, 1]
-        },
-        "Moderno": {
-            "bg": [0.9, 0.9, 0.9, 1],
-            "primary": [0.2, 0.2, 0.2, 1],
-            "accent": [0.1, 0.6, 0.4, 1],
-            "display_bg": [0.8, 0.8, 0.8, 1],
-            "display_text": [0.2, 0.2, 0.2, 1],
-            "text": [0.1, 0.1, 0.1, 1]
-        }
-    }
+    # Disparado uma vez, depois que todas as cores do novo tema foram aplicadas
+    __events__ = ('on_theme',)
+
+    def __init__(self, themes_file=THEMES_FILE, **kwargs):
+        super().__init__(**kwargs)
+        self.themes = load_themes(themes_file)
 
     def set_theme(self, name):
-        if name in self.themes:
-            t = self.themes[name]
-            self.bg_color = t["bg"]
-            self.primary_color = t["primary"]
-            self.accent_color = t["accent"]
-            self.display_bg = t["display_bg"]
-            self.display_text = t["display_text"]
-            self.text_color = t.get("text", [1, 1, 1, 1])
-            self.theme_name = name
+        if name not in self.themes:
+            return
+        t = self.themes[name]
+        # Calcula o tema inteiro antes de tocar nas propriedades e só atribui
+        # as cores que mudaram: cada widget ligado a uma cor que não mudou
+        # nem fica sabendo da troca. Tudo acontece antes do próximo frame.
+        changes = {}
+        for key, prop in THEME_PROPERTIES.items():
+            value = list(t.get(key, DEFAULT_TEXT_COLOR))
+            if getattr(self, prop) != value:
+                changes[prop] = value
+        if not changes and name == self.theme_name:
+            return
+        for prop, value in changes.items():
+            setattr(self, prop, value)
+        self.theme_name = name
+        self.dispatch('on_theme', name)
+
+    def on_theme(self, name):
+        pass
+
+    def bind_widget(self, widget, **attrs):
+        """
+        Liga atributos do widget a propriedades do tema, atualizando no lugar:
+        theme_manager.bind_widget(btn, background_color='primary_color')
+        """
+        for attr, prop in attrs.items():
+            setattr(widget, attr, getattr(self, prop))
+            self.fbind(prop, lambda instance, value, a=attr: setattr(widget, a, value))
+        return widget
 
 # Instância global
 theme_manager = ThemeManager()
@@ -0,0 +1,302 @@
+"""
+Transportes HTTP para as chamadas JointSpace (porta 1925).
+
+As chamadas são sempre as mesmas: POSTs de JSON pequeno e GETs de
+/1/system e afins, para uma só TV. `RawTransport` fala HTTP/1.1 keep-alive
+direto no socket e guarda pronto o pedido de cada tecla, sem passar por
+requests/urllib3 (nem importá-los). `RequestsTransport` é o caminho antigo,
+mantido como alternativa: AOC_TRANSPORT=requests.
+
+Os dois levantam as mesmas exceções (TransportError e filhas), para quem
+chama não depender de qual está em uso.
+"""
+import json
+import os
+import select
+import socket
+import threading
+from functools import lru_cache
+
+KEY_PATH = "/1/input/key"
+
+# `request(json=...)` esconde o módulo json dentro dos métodos
+_dumps = json.dumps
+
+class TransportError(OSError):
+    """Falha de rede numa chamada à TV."""
+
+class TransportConnectionError(TransportError):
+    """Conexão recusada, caída ou fechada pela TV: pode ser repetida."""
+
+class TransportTimeout(TransportError):
+    """A TV não respondeu a tempo. Não é repetida para não duplicar teclas."""
+
+class Headers(dict):
+    """Cabeçalhos da resposta, sem diferenciar maiúsculas (como no requests)."""
+
+    def __getitem__(self, name):
+        return dict.__getitem__(self, name.lower())
+
+    def __contains__(self, name):
+        return dict.__contains__(self, name.lower())
+
+    def get(self, name, default=None):
+        return dict.get(self, name.lower(), default)
+
+class Response:
+    """O que as chamadas usam de requests.Response: status, cabeçalhos e corpo."""
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', 'replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+# --- Transporte próprio ---
+
+@lru_cache(maxsize=512)
+def _request_head(method, path, host):
+    return f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nAccept: */*\r\n"
+
+@lru_cache(maxsize=1024)
+def _key_request(host, key):
+    # Uma tecla é sempre o mesmo pedido: monta os bytes uma vez por TV e tecla
+    body = json.dumps({'key': key}).encode('utf-8')
+    head = _request_head("POST", KEY_PATH, host)
+    return (f"{head}Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode('latin-1') + body
+
+def _build_request(method, path, host, body=None, headers=None):
+    head = _request_head(method, path, host)
+    if headers:
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    if body is not None:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    data = (head + "\r\n").encode('latin-1')
+    return data + body if body is not None else data
+
+class _Connection:
+    """Um socket keep-alive com a TV e a leitura de uma resposta HTTP/1.1."""
+
+    def __init__(self, ip, port, timeout):
+        try:
+            self.sock = socket.create_connection((ip, port), timeout)
+        except OSError as e:
+            raise TransportConnectionError(f"{ip}:{port}: {e}") from e
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = bytearray()
+        self.reusable = True
+        self.used = False        # já respondeu a algum pedido
+        self.received = False    # recebeu algo do pedido atual
+
+    def dropped(self):
+        # Socket ocioso com algo para ler é a TV fechando a conexão (EOF)
+        try:
+            return bool(select.select([self.sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return True
+
+    def close(self):
+        self.sock.close()
+
+    def _fill(self):
+        chunk = self.sock.recv(4096)
+        if not chunk:
+            raise TransportConnectionError("conexão fechada pela TV")
+        self.received = True
+        self.buffer += chunk
+
+    def _read_until(self, marker):
+        while True:
+            end = self.buffer.find(marker)
+            if end >= 0:
+                line = bytes(self.buffer[:end])
+                del self.buffer[:end + len(marker)]
+                return line
+            self._fill()
+
+    def _read_exactly(self, size):
+        while len(self.buffer) < size:
+            self._fill()
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def _read_chunked(self):
+        body = bytearray()
+        while True:
+            size = int(self._read_until(b"\r\n").split(b";", 1)[0], 16)
+            if not size:
+                while self._read_until(b"\r\n"):   # trailers, até a linha vazia
+                    pass
+                return bytes(body)
+            body += self._read_exactly(size)
+            self._read_exactly(2)
+
+    def _read_to_close(self):
+        self.reusable = False
+        while True:
+            try:
+                self._fill()
+            except TransportConnectionError:
+                data = bytes(self.buffer)
+                self.buffer.clear()
+                return data
+
+    def roundtrip(self, data, timeout, method):
+        """Envia o pedido e lê a resposta. Timeout vira TransportTimeout."""
+        sock = self.sock
+        sock.settimeout(timeout)
+        self.received = False
+        try:
+            sock.sendall(data)
+            head = self._read_until(b"\r\n\r\n")
+            lines = head.decode('latin-1').split("\r\n")
+            version, status = lines[0].split(" ", 2)[:2]
+            headers = Headers()
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            status = int(status)
+            if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+                body = b""
+            elif headers.get("transfer-encoding", "").lower() == "chunked":
+                body = self._read_chunked()
+            elif "content-length" in headers:
+                body = self._read_exactly(int(headers["content-length"]))
+            else:
+                body = self._read_to_close()
+        except socket.timeout as e:
+            self.reusable = False
+            raise TransportTimeout(str(e) or "timeout") from e
+        except (ValueError, IndexError) as e:
+            self.reusable = False
+            raise TransportError(f"resposta HTTP inválida: {e}") from e
+        except TransportError:
+            self.reusable = False
+            raise
+        except OSError as e:
+            self.reusable = False
+            raise TransportConnectionError(str(e)) from e
+        connection = headers.get("connection", "").lower()
+        if connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive"):
+            self.reusable = False
+        self.used = True
+        return Response(status, headers, body)
+
+class RawTransport:
+    """
+    HTTP/1.1 keep-alive para uma TV, com até `pool_size` sockets abertos
+    (um por envio simultâneo, como o pool do urllib3).
+    """
+
+    def __init__(self, ip, port, pool_size=2):
+        self.ip = ip
+        self.port = port
+        self.host = f"{ip}:{port}"
+        self.pool_size = pool_size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def _acquire(self, timeout):
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if not conn.dropped():
+                    return conn
+                conn.close()
+        return _Connection(self.ip, self.port, timeout)
+
+    def _release(self, conn):
+        if conn.reusable:
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    def _roundtrip(self, data, timeout, method):
+        conn = self._acquire(timeout)
+        try:
+            response = conn.roundtrip(data, timeout, method)
+        except TransportConnectionError:
+            conn.close()
+            # A TV fechou a conexão ociosa bem quando o pedido saiu: sem
+            # nenhum byte de resposta o pedido não foi atendido, então vai de
+            # novo, uma vez, numa conexão nova.
+            if not conn.used or conn.received:
+                raise
+            conn = _Connection(self.ip, self.port, timeout)
+            try:
+                response = conn.roundtrip(data, timeout, method)
+            except BaseException:
+                conn.close()
+                raise
+        except BaseException:
+            conn.close()
+            raise
+        self._release(conn)
+        return response
+
+    def request(self, method, path, timeout, json=None, headers=None):
+        body = None
+        if json is not None:
+            body = _dumps(json).encode('utf-8')
+        return self._roundtrip(_build_request(method, path, self.host, body, headers), timeout, method)
+
+    def post_key(self, key, timeout):
+        return self._roundtrip(_key_request(self.host, key), timeout, "POST")
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+# --- requests (alternativa) ---
+
+class RequestsTransport:
+    """O mesmo contrato sobre uma requests.Session (precisa do requests instalado)."""
+
+    def __init__(self, ip, port, pool_size=2):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self._requests = requests
+        self.base_url = f"http://{ip}:{port}"
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0))
+
+    def request(self, method, path, timeout, json=None, headers=None):
+        requests = self._requests
+        try:
+            res = self.session.request(method, self.base_url + path, timeout=timeout, json=json, headers=headers)
+        except requests.ConnectionError as e:
+            # Inclui ConnectTimeout, que o requests também trata como falha de conexão
+            raise TransportConnectionError(str(e)) from e
+        except requests.Timeout as e:
+            raise TransportTimeout(str(e)) from e
+        except requests.RequestException as e:
+            raise TransportError(str(e)) from e
+        return Response(res.status_code, Headers((k.lower(), v) for k, v in res.headers.items()), res.content)
+
+    def post_key(self, key, timeout):
+        return self.request("POST", KEY_PATH, timeout, json={'key': key})
+
+    def close(self):
+        self.session.close()
+
+TRANSPORTS = {"raw": RawTransport, "requests": RequestsTransport}
+
+def transport_factory(name=None):
+    """Classe do transporte `name` (padrão: AOC_TRANSPORT, ou "raw")."""
+    name = name or os.environ.get("AOC_TRANSPORT", "raw")
+    try:
+        return TRANSPORTS[name]
+    except KeyError:
+        raise ValueError(f"Transporte desconhecido: {name!r} (use {', '.join(TRANSPORTS)})") from None
@@ -0,0 +1,229 @@
+"""
+Estado da TV conectada (volume, mudo, ligada/em espera, fonte atual),
+guardado no app para a tela mostrar sem ir à TV a cada toque.
+
+Os endpoints de estado do JointSpace são lidos uma vez ao conectar. Depois
+disso, cada VolumeUp/VolumeDown/Mute/Standby já altera o estado local
+(atualização otimista) e a conferência com a TV é feita uma só vez, quando
+o usuário para de tocar, e de tempos em tempos enquanto nada acontece.
+Essas leituras mandam If-None-Match quando a TV fornece ETag e só
+avisam a interface se algo de fato mudou.
+"""
+import threading
+import time
+
+from app.utils.network import connection_manager, TransportError
+
+VOLUME_PATH = "/1/audio/volume"
+SOURCE_PATH = "/1/sources/current"
+SOURCES_PATH = "/1/sources"
+
+ON = "on"
+STANDBY = "standby"
+
+class TvStateModel:
+    """
+    `on_change(estado)` recebe um dict com volume, volume_max, muted, power
+    e source, na thread que causou a mudança (interface, envio ou leitura).
+    """
+
+    def __init__(self, on_change=None, manager=connection_manager, settle=1.5, poll_interval=30.0):
+        self.on_change = on_change
+        self.manager = manager
+        self.settle = settle                  # silêncio antes de conferir com a TV
+        self.poll_interval = poll_interval    # conferência sem toques
+        self.ip = None
+        self.port = None
+        self._state = {}
+        self._sources = {}                    # id -> nome, lido uma vez
+        self._etags = {}                      # caminho -> ETag da última resposta
+        self._bodies = {}                     # caminho -> último JSON lido
+        self._last_key = 0.0
+        self._read_volume = True
+        self._read_source = True
+        self._lock = threading.RLock()
+        self._generation = 0
+        # Uma thread só por conexão, que dorme até `_deadline`; um toque só
+        # adia o prazo, sem criar thread nova
+        self._deadline = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._state)
+
+    def start(self, ip, port, endpoints=None):
+        """
+        Lê todo o estado (chamar numa thread de trabalho, logo após conectar).
+        `endpoints` é a sondagem de app.utils.capabilities: o que ela achou
+        ausente (False) não é consultado.
+        """
+        self.stop()
+        endpoints = endpoints or {}
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self.ip, self.port = ip, port
+            self._state = {"power": ON}
+            self._sources, self._etags, self._bodies = {}, {}, {}
+            self._read_volume = endpoints.get(VOLUME_PATH) is not False
+            self._read_source = endpoints.get(SOURCES_PATH) is not False
+        if self._read_source:
+            try:
+                res = self.manager.get(ip, port, SOURCES_PATH)
+                if res.status_code == 200:
+                    self._sources = {sid: s.get("name", sid) for sid, s in res.json().items() if isinstance(s, dict)}
+            except (TransportError, ValueError, AttributeError):
+                pass
+        self._refresh()
+        with self._lock:
+            if generation != self._generation:
+                return   # desconectou durante a leitura
+            self._schedule(self.poll_interval)
+            # Eventos novos a cada start: uma thread antiga só enxerga os dela
+            self._stop = threading.Event()
+            self._wake = threading.Event()
+            self._thread = threading.Thread(target=self._run, args=(self._stop, self._wake),
+                                            name="tv-state", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+            self._deadline = None
+            self._thread = None
+            self._stop.set()
+            self._wake.set()
+
+    def apply_key(self, key):
+        """Atualização otimista; devolve True se a tecla mexe no estado guardado."""
+        with self._lock:
+            state = self._state
+            if not state:
+                return False
+            if key in ("VolumeUp", "VolumeDown") and state.get("volume") is not None:
+                step = 1 if key == "VolumeUp" else -1
+                state["volume"] = max(state.get("volume_min", 0), min(state.get("volume_max", 100), state["volume"] + step))
+                state["muted"] = False
+            elif key == "Mute" and state.get("muted") is not None:
+                state["muted"] = not state["muted"]
+            elif key == "Standby":
+                state["power"] = STANDBY if state.get("power") == ON else ON
+            else:
+                return False
+            self._last_key = time.monotonic()
+            snapshot = dict(state)
+        self._schedule(self.settle)
+        self._notify(snapshot)
+        return True
+
+    def set_reachable(self, reachable):
+        """
+        Aviso do monitor de conexão. Uma TV em espera que volta a responder
+        foi ligada por fora (controle original); já a falta de resposta não
+        muda nada, pois pode ser só a rede.
+        """
+        with self._lock:
+            if not reachable or self._state.get("power") != STANDBY:
+                return
+            self._state["power"] = ON
+            snapshot = dict(self._state)
+        self._notify(snapshot)
+        self._schedule(0)
+
+    def _notify(self, snapshot):
+        if self.on_change:
+            self.on_change(snapshot)
+
+    def _schedule(self, delay):
+        # Só move o prazo da próxima conferência; quem a faz é a thread do _run
+        with self._lock:
+            self._deadline = time.monotonic() + delay
+        self._wake.set()
+
+    def _run(self, stop, wake):
+        while not stop.is_set():
+            with self._lock:
+                deadline = self._deadline
+            wait = None if deadline is None else deadline - time.monotonic()
+            if wait is None or wait > 0:
+                wake.wait(wait)
+                wake.clear()
+                continue
+            self._tick()
+
+    def _tick(self):
+        with self._lock:
+            quiet = time.monotonic() - self._last_key
+            standby = self._state.get("power") == STANDBY
+            if quiet < self.settle:
+                # Ainda tocando: confere quando os toques pararem
+                self._deadline = self._last_key + self.settle
+                return
+            self._deadline = time.monotonic() + self.poll_interval
+        if not standby:
+            self._refresh()
+
+    def _get(self, path):
+        """JSON de `path`, ou o último lido se a TV responder 304 (sem mudança)."""
+        headers = {}
+        etag = self._etags.get(path)
+        if etag:
+            headers["If-None-Match"] = etag
+        res = self.manager.get(self.ip, self.port, path, headers=headers)
+        if res.status_code == 304:
+            return self._bodies.get(path)
+        if res.status_code != 200:
+            return None
+        if res.headers.get("ETag"):
+            self._etags[path] = res.headers["ETag"]
+        body = res.json()
+        self._bodies[path] = body
+        return body
+
+    def _refresh(self):
+        ip, generation = self.ip, self._generation
+        fields = {}
+        try:
+            volume = self._get(VOLUME_PATH) if self._read_volume else None
+            if isinstance(volume, dict):
+                fields.update({
+                    "volume": volume.get("current"),
+                    "volume_min": volume.get("min", 0),
+                    "volume_max": volume.get("max", 100),
+                    "muted": volume.get("muted"),
+                })
+            source = self._get(SOURCE_PATH) if self._read_source else None
+            if isinstance(source, dict) and source.get("id"):
+                fields["source"] = self._sources.get(source["id"], source["id"])
+        except (TransportError, ValueError):
+            return
+        with self._lock:
+            if generation != self._generation or ip != self.ip:
+                return
+            # Toque durante a leitura: o estado otimista é mais novo que a resposta
+            if time.monotonic() - self._last_key < self.settle:
+                return
+            fields["power"] = ON
+            if all(self._state.get(k) == v for k, v in fields.items()):
+                return
+            self._state.update(fields)
+            snapshot = dict(self._state)
+        self._notify(snapshot)
+
+def status_text(state):
+    """Linha de estado do display: "VOL 18  |  MUDO  |  HDMI 1"."""
+    if not state:
+        return ""
+    if state.get("power") == STANDBY:
+        return "EM ESPERA"
+    parts = []
+    if state.get("volume") is not None:
+        parts.append(f"VOL {state['volume']}")
+    if state.get("muted"):
+        parts.append("MUDO")
+    if state.get("source"):
+        parts.append(str(state["source"]).upper())
+    return "  |  ".join(parts)
@@ -0,0 +1,167 @@
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.popup import Popup
+from kivy.uix.textinput import TextInput
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleboxlayout import RecycleBoxLayout
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.properties import StringProperty, ObjectProperty
+from app.utils.search import SearchWorker
+from app.utils.themes import theme_manager
+from app.utils.perf import perf
+
+class CategoryRow(Button):
+    # Linha reciclada da lista: o RecycleView só troca `name` e `code`
+    # (as chaves dos dicts de categoria) nos widgets visíveis.
+    name = StringProperty("")
+    code = ObjectProperty("")
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.background_color = [0.25, 0.25, 0.25, 1]
+        self.halign = 'center'
+        self.valign = 'middle'
+
+    def on_name(self, instance, value):
+        self.text = value
+
+    def on_size(self, instance, value):
+        self.text_size = value
+
+    def on_release(self):
+        NetflixSearchPopup.show_code_modal({'name': self.name, 'code': self.code})
+
+class NetflixSearchPopup(Popup):
+    SEARCH_DEBOUNCE = 0.12 # segundos sem digitar antes de buscar
+    # Itens mostrados por busca (os mais relevantes). O RecycleView só cria
+    # widgets para as linhas visíveis, mas a troca de `data` recalcula o
+    # layout de todos os itens no frame seguinte: com o catálogo 100x maior
+    # e sem limite, o frame passa de 100 ms por tecla (benchmarks/bench_search.py)
+    RESULT_LIMIT = 100
+
+    def __init__(self, index, **kwargs):
+        super().__init__(**kwargs)
+        self.title = "Buscar Categorias Netflix"
+        self.size_hint = (0.9, 0.9)
+        self.index = index # CategoryIndex sobre a lista de dicts {'name': ..., 'code': ...}
+        
+        layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
+        
+        # Campo de Busca
+        self.search_input = TextInput(
+            hint_text="Pesquisar (ex: terror, ação, anime)...",
+            multiline=False,
+            size_hint_y=None,
+            height=dp(50),
+            font_size='18sp',
+            background_color=[0.15, 0.15, 0.15, 1],
+            foreground_color=[1, 1, 1, 1],
+            cursor_color=theme_manager.primary_color
+        )
+        # A busca roda numa thread e só depois de uma pausa na digitação
+        self.search_worker = SearchWorker(index, on_result=self._on_search_result, limit=self.RESULT_LIMIT)
+        self._search_trigger = Clock.create_trigger(self._run_search, self.SEARCH_DEBOUNCE)
+        self.search_input.bind(text=self.filter_categories)
+        layout.add_widget(self.search_input)
+        
+        # Lista de Resultados
+        self.rv = RecycleView(viewclass=CategoryRow)
+        self.rv_layout = RecycleBoxLayout(
+            orientation='vertical',
+            spacing=dp(5),
+            size_hint_y=None,
+            default_size=(None, dp(55)),
+            default_size_hint=(1, None)
+        )
+        self.rv_layout.bind(minimum_height=self.rv_layout.setter('height'))
+        self.rv.add_widget(self.rv_layout)
+        layout.add_widget(self.rv)
+        
+        # Botão Fechar
+        close_btn = Button(text="VOLTAR AO CONTROLE", size_hint_y=None, height=dp(50), background_color=[0.6, 0.2, 0.2, 1], bold=True)
+        close_btn.bind(on_release=self.dismiss)
+        layout.add_widget(close_btn)
+        
+        self.content = layout
+        self.update_list(self.index.search("", limit=self.RESULT_LIMIT))
+
+    def filter_categories(self, instance, value):
+        # Reinicia a contagem a cada tecla; a busca só sai quando o usuário para
+        perf.count("search.keystrokes")
+        self._search_trigger.cancel()
+        self._search_trigger()
+
+    def _run_search(self, dt):
+        # Busca pelo índice: ignora maiúsculas/acentos, procura em qualquer parte
+        # do texto, ordena por relevância e tolera um erro de digitação
+        self.search_worker.submit(self.search_input.text)
+
+    def _on_search_result(self, generation, items, elapsed_ms):
+        perf.record("search.query", elapsed_ms)
+        def apply(dt):
+            # Outra tecla pode ter chegado enquanto o resultado vinha para cá
+            if self.search_worker.is_current(generation):
+                with perf.timer("search.update_list"):
+                    self.update_list(items)
+        Clock.schedule_once(apply, 0)
+
+    @property
+    def search_timings(self):
+        # (consulta, ms) das últimas buscas, para achar consultas lentas
+        return list(self.search_worker.timings)
+
+    def on_dismiss(self):
+        self._search_trigger.cancel()
+        self.search_worker.stop()
+
+    def update_list(self, items):
+        # Os próprios dicts de categoria viram os dados do RecycleView (sem
+        # cópia); só as linhas visíveis têm widget
+        self.rv.data = items
+
+    @staticmethod
+    def show_code_modal(item):
+        content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(20))
+        
+        content.add_widget(Label(
+            text=f"Código para:\n[b]{item['name']}[/b]",
+            markup=True,
+            halign='center',
+            font_size='18sp'
+        ))
+        
+        code_label = Label(
+            text=str(item['code']),
+            font_size='56sp',
+            bold=True,
+            color=theme_manager.primary_color
+        )
+        content.add_widget(code_label)
+        
+        msg_label = Label(
+            text="Digite este código no campo de\nbusca do seu aplicativo Netflix.",
+            halign='center',
+            font_size='14sp',
+            color=[0.7, 0.7, 0.7, 1]
+        )
+        content.add_widget(msg_label)
+        
+        btn = Button(
+            text="FECHAR",
+            size_hint_y=None,
+            height=dp(60),
+            background_color=theme_manager.primary_color,
+            bold=True
+        )
+        content.add_widget(btn)
+        
+        popup = Popup(
+            title="Código da Categoria",
+            content=content,
+            size_hint=(0.85, 0.6),
+            auto_dismiss=True
+        )
+        btn.bind(on_release=popup.dismiss)
+        popup.open()
@@ -0,0 +1,82 @@
+import os
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.metrics import dp
+from kivy.uix.label import Label
+from app.utils.perf import perf
+
+class PerfOverlay(Label):
+    """
+    Painel de desempenho sobre a tela: tempos (p50/p99/máx) e contadores
+    da instrumentação, atualizados uma vez por segundo. Tocar no painel
+    grava o JSON em perf.json, na pasta de dados do app.
+    """
+
+    MAX_LINES = 14
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.font_name = 'RobotoMono-Regular'
+        self.font_size = '11sp'
+        self.halign = 'left'
+        self.valign = 'top'
+        self.size_hint = (None, None)
+        self.padding = (dp(6), dp(4))
+        self.color = [0.6, 1, 0.6, 1]
+        with self.canvas.before:
+            Color(0, 0, 0, 0.75)
+            self._bg = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_bg, size=self._update_bg, texture_size=self._fit)
+        self._refresh_event = None
+        self._status = ""
+
+    def _update_bg(self, *args):
+        self._bg.pos = self.pos
+        self._bg.size = self.size
+
+    def _fit(self, instance, size):
+        self.size = size
+        if self.parent:
+            self.pos = (0, self.parent.height - self.height)
+
+    def show(self, window):
+        window.add_widget(self)
+        self._refresh_event = Clock.schedule_interval(self.refresh, 1.0)
+        self.refresh()
+
+    def hide(self):
+        if self._refresh_event is not None:
+            self._refresh_event.cancel()
+            self._refresh_event = None
+        if self.parent:
+            self.parent.remove_widget(self)
+
+    def refresh(self, *args):
+        snapshot = perf.snapshot()
+        lines = [f"{'tempo':<22}{'n':>5}{'p50':>7}{'p99':>7}{'máx':>8}"]
+        for name, t in snapshot["timers"].items():
+            lines.append(f"{name[:22]:<22}{t['count']:>5}{t['p50_ms']:>7.0f}{t['p99_ms']:>7.0f}{t['max_ms']:>8.1f}")
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name[:22]:<22}{value:>5}")
+        app = App.get_running_app()
+        dispatcher = getattr(app, 'dispatcher', None)
+        if dispatcher is not None:
+            stats = dispatcher.stats()
+            lines.append(f"fila {stats['depth']}  descartadas {stats['dropped']}  seguradas {stats['throttled']}")
+        if self._status:
+            lines.append(self._status)
+        self.text = "\n".join(lines[:self.MAX_LINES])
+        self._fit(self, self.texture_size)  # acompanha rotação/redimensionamento
+
+    def on_touch_down(self, touch):
+        if not self.collide_point(*touch.pos):
+            return super().on_touch_down(touch)
+        app = App.get_running_app()
+        try:
+            path = perf.dump(os.path.join(app.user_data_dir, "perf.json"))
+            self._status = f"salvo em {path}"
+        except OSError as e:
+            self._status = f"erro ao salvar: {e}"
+        self.refresh()
+        return True
@@ -0,0 +1,48 @@
+from kivy.uix.button import Button
+from kivy.clock import Clock
+from kivy.properties import NumericProperty
+
+class RepeatButton(Button):
+    """
+    Botão que, segurado, repete: dispara `on_press` ao tocar e, depois de
+    `initial_delay` segundos, `on_repeat` `repeat_rate` vezes por segundo
+    até soltar. Quem trata `on_repeat` decide se a repetição vai para a TV.
+    """
+
+    initial_delay = NumericProperty(0.4)
+    repeat_rate = NumericProperty(8)
+
+    __events__ = ('on_repeat',)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._repeat_event = None
+
+    def on_press(self):
+        self._cancel_repeat()
+        self._repeat_event = Clock.schedule_once(self._start_repeat, self.initial_delay)
+
+    def on_release(self):
+        self._cancel_repeat()
+
+    def on_disabled(self, instance, value):
+        if value:
+            self._cancel_repeat()
+
+    def _start_repeat(self, dt):
+        self._repeat_event = Clock.schedule_interval(self._repeat, 1.0 / max(self.repeat_rate, 1))
+        self._repeat(0)
+
+    def _repeat(self, dt):
+        if self.state != 'down':
+            self._cancel_repeat()
+            return False
+        self.dispatch('on_repeat')
+
+    def _cancel_repeat(self):
+        if self._repeat_event is not None:
+            self._repeat_event.cancel()
+            self._repeat_event = None
+
+    def on_repeat(self):
+        pass
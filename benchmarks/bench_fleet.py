@@ -0,0 +1,34 @@
+"""
+Modo frota: Standby para 50 TVs falsas (20 ms de latência cada), uma por
+vez como o app faria contra o envio paralelo do Fleet.
+
+Uso: python -m benchmarks.bench_fleet
+"""
+from app.utils.fleet import Fleet
+from app.utils.registry import tv_registry
+from benchmarks.common import summarize, use_temp_registry
+from benchmarks.fake_tv import FakeTvConfig, FakeTvProcess, fake_subnet, TV_PORT
+
+TVS = fake_subnet("127.0.10.", 50)
+CONFIG = FakeTvConfig(latency=0.020, jitter=0.005, seed=7)
+
+def main():
+    use_temp_registry()
+    for i, ip in enumerate(TVS):
+        tv_registry.update(ip, port=TV_PORT, name=f"Sala {i // 10 + 1} - TV {i % 10 + 1}")
+    with FakeTvProcess(TVS, CONFIG):
+        sequential = Fleet(concurrency=1)
+        parallel = Fleet(concurrency=64)
+        targets = parallel.resolve()
+        for label, fleet in (("uma por vez", sequential), ("paralelo", parallel)):
+            fleet.connect(targets)
+            report = fleet.send_key(targets, "Standby")
+            per_tv = summarize([r.elapsed_ms for r in report.results])
+            print(f"{label:<12} {report.elapsed_ms:8.1f} ms para {len(targets)} TVs  "
+                  f"(por TV p50 {per_tv['p50_ms']:.1f} ms)  ok {report.summary()['ok']}")
+            fleet.close()
+        sala2 = parallel.resolve(["sala 2*"])
+        print(f"\"sala 2*\" -> {len(sala2)} TVs")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Latência por tecla: requests.post avulso (como era antes) contra a sessão
+keep-alive do TvConnectionManager.
+
+Uso: python -m benchmarks.bench_keys
+"""
+import statistics
+import time
+
+import requests
+
+from app.utils.network import send_tv_command, connection_manager
+from benchmarks.fake_tv import FakeTvProcess, TV_PORT
+
+TV_IP = "127.0.6.10"
+PRESSES = 300
+
+def legacy_send(cmd):
+    requests.post(f"http://{TV_IP}:{TV_PORT}/1/input/key", json={'key': cmd}, timeout=1)
+
+def pooled_send(cmd):
+    send_tv_command(TV_IP, TV_PORT, cmd)
+
+def measure(label, send):
+    samples = []
+    for _ in range(PRESSES):
+        start = time.perf_counter()
+        send("CursorDown")
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<10} p50 {statistics.median(samples):6.2f} ms  p99 {p99:6.2f} ms")
+
+def main():
+    with FakeTvProcess([TV_IP]):
+        measure("avulso", legacy_send)
+        measure("keep-alive", pooled_send)
+    connection_manager.close_all()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Compara a varredura antiga (ThreadPoolExecutor com 60 workers e um
+requests.get por IP) com a varredura assíncrona de app/utils/network.py e
+com a descoberta de app/utils/discovery.py partindo de uma TV já conhecida
+e de uma TV que mudou de IP mas está na tabela de vizinhos (ARP) com o MAC
+já visto. Para as duas últimas também conta quantos hosts foram
+verificados até a primeira TV.
+
+Uso: python -m benchmarks.bench_scan
+
+A sub-rede falsa fica em 127.0.5.0/24. Em loopback os hosts sem TV recusam
+a conexão na hora, então o tempo absoluto é menor do que numa rede Wi-Fi
+real (onde o connect expira); o que interessa aqui é a comparação.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from app.utils.network import scan_single_ip, scan_hosts
+from app.utils.discovery import iter_discovery_events
+from app.utils.registry import tv_registry
+from benchmarks.common import ThreadPeakSampler, use_temp_registry
+from benchmarks.fake_tv import FakeTvProcess
+
+PREFIX = "127.0.5."
+TV_HOSTS = [f"{PREFIX}{i}" for i in (7, 42, 120, 200)]
+ALL_HOSTS = [f"{PREFIX}{i}" for i in range(1, 255)]
+
+def legacy_scan():
+    found = []
+    with ThreadPoolExecutor(max_workers=60) as executor:
+        futures = [executor.submit(scan_single_ip, ip) for ip in ALL_HOSTS]
+        for future in as_completed(futures):
+            result = future.result()
+            if result:
+                found.append(result)
+    return found
+
+def async_scan():
+    found = []
+    scan_hosts(ALL_HOSTS, on_found=lambda ip, name: found.append((ip, name)))
+    return found
+
+def _first_tv(hints, neighbors):
+    # Poucas verificações simultâneas: em loopback os hosts vazios recusam na
+    # hora e, com 64, a contagem mediria a ordem de término, não a de envio
+    found = []
+    events = iter_discovery_events(
+        interfaces=[("lo", f"{PREFIX}1", "255.255.255.0")], hints=hints, announcements=False,
+        neighbors=neighbors, concurrency=4
+    )
+    for event in events:
+        if event.kind == 'found':
+            found.append((event.ip, event.name))
+            print(f"{'':<10} primeira TV após {event.done} verificações")
+            # Tempo até a primeira TV: é o que o usuário sente ao reabrir o app
+            events.close()
+    return found
+
+def discovery_scan():
+    return _first_tv([TV_HOSTS[-1]], {})
+
+def neighbor_scan():
+    # A TV era 127.0.5.3 e voltou como 127.0.5.200; o registro guardou o
+    # MAC e a tabela ARP tem 40 vizinhos vivos
+    tv_registry.update(f"{PREFIX}3", port=1925, mac="70:af:24:00:00:c8")
+    neighbors = {f"{PREFIX}{i}": f"02:00:00:00:00:{i:02x}" for i in range(150, 190)}
+    neighbors[TV_HOSTS[-1]] = "70:af:24:00:00:c8"
+    return _first_tv([f"{PREFIX}3"], neighbors)
+
+def measure(label, scan):
+    with ThreadPeakSampler() as sampler:
+        start = time.perf_counter()
+        found = scan()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed * 1000:8.1f} ms  pico de threads: {sampler.peak:3d}  TVs: {len(found)}")
+    return found
+
+def main():
+    use_temp_registry()
+    with FakeTvProcess(TV_HOSTS):
+        measure("antiga", legacy_scan)
+        measure("asyncio", async_scan)
+        measure("conhecida", discovery_scan)
+        measure("vizinhos", neighbor_scan)
+
+if __name__ == '__main__':
+    main()
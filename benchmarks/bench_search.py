@@ -0,0 +1,127 @@
+"""
+Busca de categorias por tecla, num conjunto sintético 100x maior que
+netflix_codes_full.json, pelo mesmo caminho da NetflixSearchPopup:
+
+- busca: varredura linear antiga contra CategoryIndex.search com o limite
+  do popup (RESULT_LIMIT), como roda na thread do SearchWorker;
+- frame: na thread principal, a troca de `rv.data` do popup e o frame
+  seguinte (Clock.tick), que recalcula o layout do RecycleView, com o pico
+  de memória alocada nesse frame, para as teclas que mudam o resultado.
+  "sem limite" mostra o custo de ligar o resultado inteiro.
+
+Uso: python -m benchmarks.bench_search
+"""
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "offscreen")
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+# Sem limite de fps: Clock.tick() não dorme até o próximo frame
+os.environ.setdefault("KCFG_GRAPHICS_MAXFPS", "0")
+
+from kivy.clock import Clock
+
+from app.utils.search import CategoryIndex
+from app.widgets.netflix_search import NetflixSearchPopup
+
+SCALE = 100
+QUERIES = ["thriller psychological", "acao anime", "sci-fi cult", "horor"]
+JSON_PATH = os.path.join(os.path.dirname(__file__), '..', 'assets', 'netflix_codes_full.json')
+# Área visível da lista num celular (px)
+VIEWPORT = (400, 700)
+
+def synthetic_categories():
+    with open(JSON_PATH, encoding='utf-8') as f:
+        data = json.load(f)
+    rng = random.Random(42)
+    words = sorted({w for item in data for w in item.get('subcategory', '').split()})
+    items = []
+    for copy in range(SCALE):
+        for item in data:
+            extra = rng.choice(words)
+            items.append({
+                'name': f"{item.get('category', '')} - {item.get('subcategory', '')} {extra} {copy}",
+                'code': item.get('code', 0) * SCALE + copy,
+            })
+    return items
+
+def legacy_filter(categories, value):
+    search_terms = value.lower().split()
+    filtered = []
+    for c in categories:
+        cat_name = c['name'].lower()
+        if all(term in cat_name for term in search_terms):
+            filtered.append(c)
+    return filtered[:100]
+
+def keystrokes(query):
+    return [query[:n] for n in range(1, len(query) + 1)]
+
+def report(label, samples, unit="ms"):
+    samples.sort()
+    p99 = samples[max(0, int(len(samples) * 0.99) - 1)]
+    print(f"{label:<18} p50 {statistics.median(samples):8.2f} {unit}  p99 {p99:8.2f} {unit}  max {samples[-1]:8.2f} {unit}")
+
+def bind_frame(popup, items):
+    """Troca os dados do RecycleView e roda o frame seguinte; devolve ms."""
+    start = time.perf_counter()
+    popup.update_list(items)
+    Clock.tick()
+    return (time.perf_counter() - start) * 1000
+
+def bind_peak_kib(popup, items):
+    tracemalloc.start()
+    popup.update_list(items)
+    Clock.tick()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+def main():
+    categories = synthetic_categories()
+    print(f"{len(categories)} categorias sintéticas")
+
+    start = time.perf_counter()
+    index = CategoryIndex(categories)
+    print(f"construção do índice: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    popup = NetflixSearchPopup(index)
+    popup.search_worker.stop()
+    popup.rv.size = VIEWPORT
+    Clock.tick()
+    limit = NetflixSearchPopup.RESULT_LIMIT
+
+    texts = [text for query in QUERIES for text in keystrokes(query)]
+    legacy, indexed = [], []
+    results = {limit: [], None: []}
+    for text in texts:
+        start = time.perf_counter()
+        legacy_filter(categories, text)
+        legacy.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        results[limit].append(index.search(text, limit=limit))
+        indexed.append((time.perf_counter() - start) * 1000)
+        results[None].append(index.search(text))
+
+    print("busca (thread do SearchWorker)")
+    report("  linear", legacy)
+    report(f"  índice ({limit})", indexed)
+    print("frame (thread principal: rv.data + layout)")
+    for cap, label in ((limit, f"  limite {limit}"), (None, "  sem limite")):
+        # Na ordem da digitação; só as teclas que mudam o resultado contam
+        # (resultado igual ao anterior não troca os dados nem custa frame)
+        changed = [items for prev, items in zip([None] + results[cap], results[cap]) if items != prev]
+        frames = [bind_frame(popup, items) for items in changed]
+        peaks = [bind_peak_kib(popup, items) for items in changed]
+        print(f"  ({len(changed)} de {len(texts)} teclas mudam o resultado)")
+        report(label, frames)
+        report(label + " mem", peaks, unit="KiB")
+
+if __name__ == '__main__':
+    main()
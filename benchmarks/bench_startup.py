@@ -0,0 +1,68 @@
+"""
+Tempo de abertura do app, sem tela (SDL offscreen): import do main.py,
+tempo até o primeiro frame e até as telas de controle ficarem prontas.
+Cada rodada é um interpretador novo, como numa abertura a frio.
+
+Uso: python -m benchmarks.bench_startup [rodadas]
+
+Também confere que a pilha HTTP (requests) não foi carregada antes do
+primeiro frame.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = r'''
+import json, sys, time
+t0 = time.perf_counter()
+import main
+t_import = time.perf_counter()
+from kivy.clock import Clock
+app = main.RemoteControlApp()
+result = {"import_ms": (t_import - t0) * 1000}
+
+def first_frame(dt):
+    result["first_frame_ms"] = (time.perf_counter() - t0) * 1000
+    result["requests_loaded"] = "requests" in sys.modules
+    Clock.schedule_interval(wait_prewarm, 0)
+
+def wait_prewarm(dt):
+    if all(app.sm.has_screen(name) for name in app.REMOTE_SCREENS):
+        result["screens_ready_ms"] = (time.perf_counter() - t0) * 1000
+        app.stop()
+        return False
+
+Clock.schedule_once(first_frame, 0)
+app.run()
+print("RESULT " + json.dumps(result))
+'''
+
+def run_once(workdir):
+    env = dict(os.environ, SDL_VIDEODRIVER="offscreen", KIVY_NO_ARGS="1", KIVY_NO_CONSOLELOG="1",
+               PYTHONPATH=ROOT)
+    # Roda fora do repositório para o app não gravar tv_data.json nele
+    out = subprocess.run([sys.executable, "-c", CHILD], cwd=workdir, env=env,
+                         capture_output=True, text=True, timeout=120)
+    for line in out.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[7:])
+    raise RuntimeError(f"app não abriu:\n{out.stderr[-2000:]}")
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workdir = tempfile.mkdtemp(prefix="aoc-startup-")
+    results = [run_once(workdir) for _ in range(runs)]
+    for key, label in (("import_ms", "import main"), ("first_frame_ms", "1o frame"),
+                       ("screens_ready_ms", "telas prontas")):
+        values = [r[key] for r in results]
+        print(f"{label:<14} mediana {statistics.median(values):7.1f} ms  min {min(values):7.1f} ms  max {max(values):7.1f} ms")
+    if any(r["requests_loaded"] for r in results):
+        print("ATENÇÃO: requests foi importado antes do primeiro frame")
+
+if __name__ == '__main__':
+    main()
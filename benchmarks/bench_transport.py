@@ -0,0 +1,83 @@
+"""
+Transporte próprio (socket) contra requests, para a mesma TV falsa:
+
+- por tecla: latência p50/p99, CPU do processo e pico de memória de um envio;
+- frota: Standby para 50 TVs em paralelo (o custo de CPU aparece no GIL);
+- import: tempo para carregar cada transporte num interpretador novo.
+
+Uso: python -m benchmarks.bench_transport [--json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from app.utils.fleet import Fleet
+from app.utils.network import TvConnectionManager
+from app.utils.registry import tv_registry
+from app.utils.transport import TRANSPORTS
+from benchmarks.common import summarize, use_temp_registry
+from benchmarks.fake_tv import FakeTvConfig, FakeTvProcess, fake_subnet, TV_PORT
+
+TV_IP = "127.0.6.20"
+FLEET = fake_subnet("127.0.11.", 50)
+PRESSES = 500
+
+IMPORTS = {"raw": "app.utils.transport", "requests": "requests"}
+
+def bench_keys(name):
+    manager = TvConnectionManager(transport=TRANSPORTS[name])
+    manager.post_key(TV_IP, TV_PORT, "CursorDown")      # conexão já aberta
+    samples = []
+    cpu = time.process_time()
+    for _ in range(PRESSES):
+        start = time.perf_counter()
+        manager.post_key(TV_IP, TV_PORT, "CursorDown")
+        samples.append((time.perf_counter() - start) * 1000)
+    cpu_us = (time.process_time() - cpu) * 1e6 / PRESSES
+    tracemalloc.start()
+    manager.post_key(TV_IP, TV_PORT, "CursorDown")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    manager.close_all()
+    return dict(summarize(samples), cpu_us=cpu_us, peak_bytes=peak)
+
+def bench_fleet(name):
+    fleet = Fleet(manager=TvConnectionManager(idle_timeout=300, transport=TRANSPORTS[name]))
+    targets = fleet.resolve()
+    fleet.connect(targets)
+    walls = []
+    for _ in range(5):
+        walls.append(fleet.send_key(targets, "Standby").elapsed_ms)
+    fleet.close()
+    return {"wall_ms": min(walls)}
+
+def bench_import(module, runs=5):
+    code = f"import time; t = time.perf_counter(); import {module}; print((time.perf_counter() - t) * 1000)"
+    times = [float(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+             for _ in range(runs)]
+    return {"import_ms": min(times)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+    use_temp_registry()
+    for ip in FLEET:
+        tv_registry.update(ip, port=TV_PORT)
+    results = {}
+    with FakeTvProcess([TV_IP] + FLEET, FakeTvConfig(latency=0.002, seed=3)):
+        for name in TRANSPORTS:
+            results[name] = dict(bench_keys(name), fleet_ms=bench_fleet(name)["wall_ms"], **bench_import(IMPORTS[name]))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, r in results.items():
+        print(f"{name:<9} tecla p50 {r['p50_ms']:5.2f} ms  p99 {r['p99_ms']:5.2f} ms  "
+              f"CPU {r['cpu_us']:6.0f} us  pico {r['peak_bytes'] / 1024:5.1f} KiB  "
+              f"frota(50) {r['fleet_ms']:6.1f} ms  import {r['import_ms']:5.1f} ms")
+
+if __name__ == '__main__':
+    main()
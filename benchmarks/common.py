@@ -0,0 +1,77 @@
+"""Utilitários compartilhados pelos benchmarks."""
+import os
+import resource
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from app.utils.registry import tv_registry
+
+def use_temp_registry():
+    """Aponta o tv_registry global para um arquivo temporário (não suja o tv_data.json)."""
+    tv_registry.path = os.path.join(tempfile.mkdtemp(prefix="aoc-bench-"), "tv_data.json")
+    return tv_registry.path
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(0, int(round(len(ordered) * pct / 100.0)) - 1)]
+
+def summarize(samples):
+    """p50/p99/máximo de uma lista de tempos em ms."""
+    if not samples:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    return {
+        "p50_ms": statistics.median(samples),
+        "p99_ms": percentile(samples, 99),
+        "max_ms": max(samples),
+    }
+
+class ThreadPeakSampler:
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Desconta a própria thread do amostrador
+            self.peak = max(self.peak, threading.active_count() - 1)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+class ResourceProbe:
+    """Tempo, pico de threads e de memória Python (tracemalloc) de um trecho."""
+
+    def __enter__(self):
+        self.threads = ThreadPeakSampler().__enter__()
+        tracemalloc.start()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed_ms = (time.perf_counter() - self._start) * 1000
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.threads.__exit__(*exc)
+        self.peak_threads = self.threads.peak
+        self.peak_kib = peak / 1024
+        # ru_maxrss é em KiB no Linux
+        self.max_rss_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    def as_dict(self):
+        return {
+            "elapsed_ms": self.elapsed_ms,
+            "peak_threads": self.peak_threads,
+            "py_peak_kib": self.peak_kib,
+            "max_rss_kib": self.max_rss_kib,
+        }
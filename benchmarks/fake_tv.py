@@ -0,0 +1,213 @@
+"""
+TV falsa (JointSpace) para benchmarks sem uma TV AOC/Philips real.
+
+Cada TV escuta em um IP próprio de loopback (127.0.x.y), o que permite
+simular uma sub-rede inteira na mesma máquina Linux. O servidor roda em um
+processo separado para não contaminar as medições (threads, memória).
+
+A rede pode ser piorada com FakeTvConfig: latência com jitter, perda de
+pacotes (a resposta atrasa um RTO do TCP, como quando um segmento se perde)
+e TVs sem /1/input/text. Volume, mudo e fonte reagem às teclas, e os GET
+respondem com ETag (304 para If-None-Match igual). `GET /fake/stats`
+devolve o que a TV recebeu.
+
+Uso: python -m benchmarks.fake_tv [--count 20] [--latency 0.03] [--loss 0.01] [--no-text] [ips...]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+import signal
+import zlib
+from collections import namedtuple
+
+TV_PORT = 1925
+
+# latency/jitter em segundos por resposta; loss = probabilidade de uma
+# resposta "perder um pacote" e só chegar depois de loss_penalty segundos
+FakeTvConfig = namedtuple('FakeTvConfig', 'latency jitter loss loss_penalty text_supported seed')
+FakeTvConfig.__new__.__defaults__ = (0.0, 0.0, 0.0, 0.2, True, None)
+
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found'}
+
+SOURCES = {"tv": {"name": "TV"}, "hdmi1": {"name": "HDMI 1"}, "hdmi2": {"name": "HDMI 2"}}
+
+def fake_subnet(prefix="127.0.5.", count=4, first=10):
+    """IPs de `count` TVs falsas numa sub-rede de loopback."""
+    return [f"{prefix}{first + i}" for i in range(count)]
+
+def tv_system_info(ip_address):
+    return {
+        "name": f"Fake TV {ip_address}",
+        "model": "FAKE-43PFG",
+        "serialnumber": f"FK{ip_address.replace('.', '')}",
+        "softwareversion": "QF1EU-0.1.0.0",
+    }
+
+class _FakeTv:
+    def __init__(self, ip_address, config, rng):
+        self.ip_address = ip_address
+        self.config = config
+        self.rng = rng
+        self.stats = {"requests": 0, "keys": 0, "text": "", "lost": 0, "not_modified": 0}
+        self.volume = {"muted": False, "current": 20, "min": 0, "max": 60}
+        self.source = "hdmi1"
+
+    async def _network_delay(self):
+        config = self.config
+        delay = config.latency
+        if config.jitter:
+            delay = max(0.0, self.rng.gauss(delay, config.jitter))
+        if config.loss and self.rng.random() < config.loss:
+            self.stats["lost"] += 1
+            delay += config.loss_penalty
+        if delay:
+            await asyncio.sleep(delay)
+
+    def _press(self, key):
+        volume = self.volume
+        if key in ("VolumeUp", "VolumeDown"):
+            step = 1 if key == "VolumeUp" else -1
+            volume["current"] = max(volume["min"], min(volume["max"], volume["current"] + step))
+            volume["muted"] = False
+        elif key == "Mute":
+            volume["muted"] = not volume["muted"]
+
+    def _respond(self, method, path, body):
+        if method == "GET" and path == "/1/system":
+            return 200, json.dumps(tv_system_info(self.ip_address)).encode()
+        if method == "GET" and path == "/1/audio/volume":
+            return 200, json.dumps(self.volume).encode()
+        if method == "GET" and path == "/1/sources":
+            return 200, json.dumps(SOURCES).encode()
+        if method == "GET" and path == "/1/sources/current":
+            return 200, json.dumps({"id": self.source}).encode()
+        if method == "GET" and path == "/fake/stats":
+            return 200, json.dumps(self.stats).encode()
+        if method == "POST" and path == "/1/input/key":
+            self.stats["keys"] += 1
+            try:
+                key = json.loads(body).get("key", "")
+            except ValueError:
+                key = ""
+            # Como a TV real, só teclas com nome ("a" ou " " não existem)
+            if len(key) < 2 or not key.isalnum():
+                return 400, b""
+            self._press(key)
+            # Dígitos e ponto são a digitação da TextInputPipeline sem /1/input/text
+            if key.startswith("Digit"):
+                self.stats["text"] += key[5:]
+            elif key == "Dot":
+                self.stats["text"] += "."
+            return 200, b""
+        if method == "POST" and path == "/1/input/text" and self.config.text_supported:
+            try:
+                self.stats["text"] += json.loads(body).get("text", "")
+            except ValueError:
+                pass
+            return 200, b""
+        return 404, b""
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode('latin-1').split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode('latin-1').partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                self.stats["requests"] += 1
+                await self._network_delay()
+                status, body = self._respond(method, path, body)
+                etag = ""
+                if method == "GET" and status == 200 and not path.startswith("/fake/"):
+                    etag = f'"{zlib.crc32(body):08x}"'
+                    if headers.get("if-none-match") == etag:
+                        self.stats["not_modified"] += 1
+                        status, body = 304, b""
+
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                head = (
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                )
+                if etag:
+                    head += f"ETag: {etag}\r\n"
+                writer.write((head + "\r\n").encode('latin-1') + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(addresses, port=TV_PORT, ready=None, config=FakeTvConfig()):
+    rng = random.Random(config.seed)
+    servers = []
+    for ip_address in addresses:
+        tv = _FakeTv(ip_address, config, rng)
+        servers.append(await asyncio.start_server(tv.handle, ip_address, port, reuse_address=True))
+    if ready is not None:
+        ready.set()
+    await asyncio.gather(*(s.serve_forever() for s in servers))
+
+def _serve_process(addresses, port, ready, config):
+    # Importado o app (Kivy/SDL), o fork herda o tratador de SIGTERM do SDL
+    # e o terminate() do FakeTvProcess deixaria de encerrar o processo
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    asyncio.run(serve(addresses, port, ready, config))
+
+class FakeTvProcess:
+    """Sobe as TVs falsas em outro processo: `with FakeTvProcess(ips, config): ...`"""
+
+    def __init__(self, addresses, config=FakeTvConfig(), port=TV_PORT):
+        self.addresses = list(addresses)
+        self.config = config
+        self.port = port
+        self.process = None
+
+    def __enter__(self):
+        ready = multiprocessing.Event()
+        self.process = multiprocessing.Process(
+            target=_serve_process, args=(self.addresses, self.port, ready, self.config), daemon=True
+        )
+        self.process.start()
+        if not ready.wait(10):
+            self.process.terminate()
+            raise RuntimeError("TV falsa não iniciou")
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TVs JointSpace falsas em IPs de loopback")
+    parser.add_argument("ips", nargs="*")
+    parser.add_argument("--prefix", default="127.0.5.")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--no-text", action="store_true", help="sem /1/input/text (só teclas)")
+    args = parser.parse_args(argv)
+    addresses = args.ips or fake_subnet(args.prefix, args.count)
+    config = FakeTvConfig(args.latency, args.jitter, args.loss, text_supported=not args.no_text)
+    print(f"{len(addresses)} TV(s) falsa(s) na porta {TV_PORT}: {', '.join(addresses[:5])}{' ...' if len(addresses) > 5 else ''}")
+    asyncio.run(serve(addresses, config=config))
+
+if __name__ == '__main__':
+    main()
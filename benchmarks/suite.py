@@ -0,0 +1,139 @@
+"""
+Bateria de benchmarks de ponta a ponta contra TVs falsas, para medir cada
+mudança em app/utils/network.py numa máquina Linux comum:
+
+- varredura: tempo total e até a primeira TV numa /24 com várias TVs;
+- teclas: p50/p99 por tecla em perfis de rede (cabo, Wi-Fi, Wi-Fi ruim);
+- texto: caracteres por segundo com /1/input/text e no fallback tecla a tecla;
+- threads e memória (pico Python e RSS) de cada etapa.
+
+Uso: python -m benchmarks.suite [--json resultado.json] [--quick]
+"""
+import argparse
+import json
+import time
+
+import requests
+
+from app.utils.network import (
+    connection_manager, iter_scan_events, send_tv_command, TextEntry, TextInputPipeline,
+)
+from app.utils.registry import tv_registry
+from benchmarks.common import ResourceProbe, summarize, use_temp_registry
+from benchmarks.fake_tv import FakeTvConfig, FakeTvProcess, fake_subnet, TV_PORT
+
+SCAN_PREFIX = "127.0.7."
+SCAN_TVS = fake_subnet(SCAN_PREFIX, 12, first=20)
+
+# Cada perfil usa uma TV própria, para o LatencyTracker não misturar medições
+KEY_PROFILES = [
+    ("cabo", "127.0.8.10", FakeTvConfig(latency=0.002, jitter=0.001, seed=1)),
+    ("wifi", "127.0.8.20", FakeTvConfig(latency=0.015, jitter=0.008, loss=0.01, seed=2)),
+    ("wifi-ruim", "127.0.8.30", FakeTvConfig(latency=0.040, jitter=0.030, loss=0.05, seed=3)),
+]
+
+TEXT_SAMPLE = "stranger things 4"
+# Sem /1/input/text só há teclas para dígitos e ponto (PIN, canal, IP)
+KEYS_TEXT_SAMPLE = "192.168.0.42"
+
+def bench_scan():
+    hosts = [f"{SCAN_PREFIX}{i}" for i in range(1, 255)]
+    with FakeTvProcess(SCAN_TVS, FakeTvConfig(latency=0.005, jitter=0.002, seed=4)):
+        first = None
+        found = 0
+        with ResourceProbe() as probe:
+            start = time.perf_counter()
+            for event in iter_scan_events(hosts):
+                if event.kind == 'found':
+                    found += 1
+                    if first is None:
+                        first = (time.perf_counter() - start) * 1000
+    result = probe.as_dict()
+    result.update({"hosts": len(hosts), "tvs_found": found, "tvs_expected": len(SCAN_TVS), "first_tv_ms": first})
+    return result
+
+def bench_keys(presses):
+    results = {}
+    for label, ip, config in KEY_PROFILES:
+        with FakeTvProcess([ip], config):
+            samples = []
+            failures = 0
+            with ResourceProbe() as probe:
+                for _ in range(presses):
+                    start = time.perf_counter()
+                    if not send_tv_command(ip, TV_PORT, "CursorDown"):
+                        failures += 1
+                    samples.append((time.perf_counter() - start) * 1000)
+            connection_manager.close(ip, TV_PORT)
+        result = summarize(samples)
+        result.update(probe.as_dict())
+        result.update({"presses": presses, "failures": failures})
+        results[label] = result
+    return results
+
+def _received_text(ip):
+    return requests.get(f"http://{ip}:{TV_PORT}/fake/stats", timeout=2).json()["text"]
+
+def bench_text(repeats):
+    results = {}
+    pipeline = TextInputPipeline(connection_manager, tv_registry)
+    for label, ip, config, sample in (
+        ("endpoint", "127.0.9.10", FakeTvConfig(latency=0.015, jitter=0.005, seed=5), TEXT_SAMPLE),
+        ("tecla-a-tecla", "127.0.9.20", FakeTvConfig(latency=0.015, jitter=0.005, seed=6, text_supported=False),
+         KEYS_TEXT_SAMPLE),
+    ):
+        with FakeTvProcess([ip], config):
+            chars = 0
+            ok = True
+            with ResourceProbe() as probe:
+                for _ in range(repeats):
+                    entry = TextEntry(sample)
+                    ok = pipeline.send(ip, TV_PORT, entry) and ok
+                    chars += entry.sent
+            delivered = _received_text(ip) == sample * repeats
+            connection_manager.close(ip, TV_PORT)
+        result = probe.as_dict()
+        result.update({
+            "chars": chars,
+            "chars_per_s": chars / (probe.elapsed_ms / 1000) if probe.elapsed_ms else None,
+            "ok": ok,
+            "delivered_intact": delivered,
+        })
+        results[label] = result
+    return results
+
+def _print_report(results):
+    scan = results["scan"]
+    print(f"varredura  {scan['elapsed_ms']:8.1f} ms  1a TV {scan['first_tv_ms'] or 0:7.1f} ms  "
+          f"TVs {scan['tvs_found']}/{scan['tvs_expected']}  threads {scan['peak_threads']:3d}  "
+          f"mem {scan['py_peak_kib']:8.1f} KiB")
+    for label, r in results["keys"].items():
+        print(f"tecla {label:<10} p50 {r['p50_ms']:7.2f} ms  p99 {r['p99_ms']:7.2f} ms  "
+              f"falhas {r['failures']:3d}/{r['presses']}  threads {r['peak_threads']:3d}")
+    for label, r in results["text"].items():
+        print(f"texto {label:<14} {r['chars_per_s']:8.1f} car/s  íntegro {'sim' if r['delivered_intact'] else 'NÃO'}  "
+              f"threads {r['peak_threads']:3d}  mem {r['py_peak_kib']:8.1f} KiB")
+    print(f"RSS máximo do processo: {results['max_rss_kib'] / 1024:.1f} MiB")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de ponta a ponta com TVs falsas")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    parser.add_argument("--quick", action="store_true", help="menos repetições")
+    args = parser.parse_args(argv)
+
+    use_temp_registry()
+    results = {
+        "scan": bench_scan(),
+        "keys": bench_keys(100 if args.quick else 400),
+        "text": bench_text(2 if args.quick else 8),
+    }
+    connection_manager.close_all()
+    results["max_rss_kib"] = max(r["max_rss_kib"] for r in
+                                 [results["scan"], *results["keys"].values(), *results["text"].values()])
+    _print_report(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == '__main__':
+    main()
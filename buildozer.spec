@@ -3,9 +3,11 @@ title = Controle AOC Pro
 package.name = controleaocpro
 package.domain = org.ag40459
 source.dir = .
-source.include_exts = py,png,jpg,kv,atlas
+source.include_exts = py,png,jpg,kv,atlas,json,bin
 version = 1.0.0
-requirements = python3,kivy,requests,urllib3,charset-normalizer,idna
+# requests não vai no APK: a rede usa app/utils/transport.py (socket); o
+# transporte alternativo AOC_TRANSPORT=requests é só para o desktop
+requirements = python3,kivy
 
 orientation = all
 osx.python_version = 3
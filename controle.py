@@ -1,8 +1,86 @@
 # Este arquivo foi mantido para compatibilidade.
 # A nova estrutura modular do projeto está na pasta 'app/'.
-# Para executar o aplicativo completo, use o arquivo 'main.py'.
+# Sem argumentos abre o aplicativo (main.py); com um comando, controla
+# várias TVs de uma vez pela linha de comando, sem interface (modo frota):
+#
+#   python controle.py list
+#   python controle.py key Standby -t "Sala 2*" -t 192.168.0.50
+#   python controle.py text "stranger things" -t @recepcao
+#   python controle.py macro "Home, CursorDown*3, Confirm"
+#   python controle.py group recepcao -t "Recepção*"
 
-import main
+import argparse
+import sys
+
+def _print_report(report):
+    for r in report.results:
+        label = f"{r.name} ({r.ip})" if r.name else r.ip
+        status = "ok " if r.ok else "ERRO"
+        detail = f"  {r.error}" if r.error else ""
+        print(f"{status} {r.elapsed_ms:8.1f} ms  {label}{detail}")
+    s = report.summary()
+    p50 = f"{s['p50_ms']:.1f}" if s['p50_ms'] is not None else "-"
+    print(f"{s['ok']}/{s['tvs']} TVs em {s['wall_ms']:.1f} ms (p50 por TV {p50} ms)")
+
+def fleet_main(argv):
+    from app.utils.fleet import Fleet
+    from app.utils.macros import macro_store
+    from app.utils.registry import tv_registry
+
+    parser = argparse.ArgumentParser(prog="controle.py", description="Controle de várias TVs AOC sem interface")
+    parser.add_argument("-t", "--target", action="append", help="IP, nome, padrão (\"Sala*\") ou @grupo; repetível. Padrão: todas")
+    parser.add_argument("-j", "--jobs", type=int, default=64, help="envios simultâneos (padrão 64)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="TVs conhecidas (tv_data.json)")
+    sub.add_parser("ping", help="abre e confere a conexão com cada TV")
+    sub.add_parser("key", help="envia uma tecla").add_argument("key")
+    sub.add_parser("text", help="digita um texto").add_argument("text")
+    sub.add_parser("macro", help="macro salva (nome) ou passos (\"Home, CursorDown*3\")").add_argument("macro")
+    sub.add_parser("group", help="coloca as TVs alvo num grupo").add_argument("group")
+    args = parser.parse_args(argv)
+
+    fleet = Fleet(concurrency=args.jobs)
+    try:
+        targets = fleet.resolve(args.target)
+    except ValueError as e:
+        parser.error(str(e))
+    if not targets:
+        print("Nenhuma TV no tv_data.json; busque as TVs pelo app ou informe IPs com -t.")
+        return 1
+    try:
+        if args.command == "list":
+            for t in targets:
+                group = (tv_registry.get(t.ip) or {}).get("group")
+                print(f"{t.ip:<16} {t.name or '-':<24} {'@' + group if group else ''}")
+            return 0
+        if args.command == "group":
+            for t in targets:
+                fleet.set_group(t.ip, args.group)
+            print(f"{len(targets)} TVs no grupo @{args.group}")
+            return 0
+        if args.command == "ping":
+            report = fleet.connect(targets)
+        else:
+            # Conexões abertas antes: o envio em si fica em ~1 RTT por TV
+            fleet.connect(targets)
+            if args.command == "key":
+                report = fleet.send_key(targets, args.key)
+            elif args.command == "text":
+                report = fleet.send_text(targets, args.text)
+            else:
+                steps = macro_store.get(args.macro) or args.macro
+                try:
+                    report = fleet.run_macro(targets, steps, name=args.macro)
+                except ValueError as e:
+                    parser.error(str(e))
+        _print_report(report)
+        return 0 if report.ok else 2
+    finally:
+        fleet.close()
+        tv_registry.flush()
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        sys.exit(fleet_main(sys.argv[1:]))
+    import main
     main.RemoteControlApp().run()
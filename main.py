@@ -1,204 +1,227 @@
 import threading
-import requests
-import json
-import os
-import re
 from kivy.app import App
 from kivy.uix.screenmanager import ScreenManager, FadeTransition
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 from kivy.uix.boxlayout import BoxLayout
-from kivy.uix.gridlayout import GridLayout
 from kivy.uix.button import Button
 from kivy.uix.textinput import TextInput
-from kivy.uix.recycleview import RecycleView
 from kivy.clock import Clock
 from kivy.core.window import Window
-from kivy.properties import StringProperty, ListProperty, DictProperty
+from kivy.properties import StringProperty, ListProperty
 from kivy.metrics import dp
 
 from app.screens.scan_screen import ScanScreen
-from app.screens.remote_portrait import RemotePortraitScreen
-from app.screens.remote_landscape import RemoteLandscapeScreen
-from app.utils.network import send_tv_command, send_tv_text, save_custom_name, get_custom_name
+from app.utils.network import send_tv_text, save_custom_name, get_custom_name, connection_manager, TextEntry, TransportError
+from app.utils.dispatcher import CommandDispatcher
+from app.utils.registry import tv_registry
+from app.utils.capabilities import tv_capabilities, BLOCKED, KEY_REJECTED_STATUS
+from app.utils.macros import MacroRun, macro_store
+from app.utils.health import ConnectionMonitor, CONNECTED
+from app.utils.tv_state import TvStateModel, status_text
 from app.utils.themes import theme_manager
-
-class NetflixSearchPopup(Popup):
-    def __init__(self, categories, **kwargs):
-        super().__init__(**kwargs)
-        self.title = "Buscar Categorias Netflix"
-        self.size_hint = (0.9, 0.9)
-        self.categories = categories # List of dicts: {'name': ..., 'code': ...}
-        
-        layout = BoxLayout(orientation='vertical', padding=dp(10), spacing=dp(10))
-        
-        # Campo de Busca
-        self.search_input = TextInput(
-            hint_text="Pesquisar (ex: terror, ação, anime)...",
-            multiline=False,
-            size_hint_y=None,
-            height=dp(50),
-            font_size='18sp',
-            background_color=[0.15, 0.15, 0.15, 1],
-            foreground_color=[1, 1, 1, 1],
-            cursor_color=theme_manager.primary_color
-        )
-        self.search_input.bind(text=self.filter_categories)
-        layout.add_widget(self.search_input)
-        
-        # Lista de Resultados
-        self.rv = RecycleView()
-        self.rv_layout = GridLayout(cols=1, spacing=dp(5), size_hint_y=None)
-        self.rv_layout.bind(minimum_height=self.rv_layout.setter('height'))
-        self.rv.add_widget(self.rv_layout)
-        layout.add_widget(self.rv)
-        
-        # Botão Fechar
-        close_btn = Button(text="VOLTAR AO CONTROLE", size_hint_y=None, height=dp(50), background_color=[0.6, 0.2, 0.2, 1], bold=True)
-        close_btn.bind(on_release=self.dismiss)
-        layout.add_widget(close_btn)
-        
-        self.content = layout
-        self.update_list(self.categories[:50]) # Mostrar apenas os primeiros 50 inicialmente para performance
-
-    def filter_categories(self, instance, value):
-        if not value:
-            self.update_list(self.categories[:50])
-            return
-            
-        # Lógica de busca inteligente: ignorar maiúsculas/minúsculas e procurar em qualquer parte do texto
-        search_terms = value.lower().split()
-        filtered = []
-        for c in self.categories:
-            cat_name = c['name'].lower()
-            # Verifica se todos os termos digitados estão presentes no nome da categoria (em qualquer ordem)
-            if all(term in cat_name for term in search_terms):
-                filtered.append(c)
-        
-        self.update_list(filtered[:100]) # Limitar a 100 resultados para manter fluidez
-
-    def update_list(self, items):
-        self.rv_layout.clear_widgets()
-        for item in items:
-            btn = Button(
-                text=item['name'],
-                size_hint_y=None,
-                height=dp(55),
-                background_color=[0.25, 0.25, 0.25, 1],
-                halign='center',
-                valign='middle'
-            )
-            btn.bind(size=btn.setter('text_size'))
-            btn.bind(on_release=lambda x, it=item: self.show_code_modal(it))
-            self.rv_layout.add_widget(btn)
-
-    def show_code_modal(self, item):
-        content = BoxLayout(orientation='vertical', padding=dp(20), spacing=dp(20))
-        
-        content.add_widget(Label(
-            text=f"Código para:\n[b]{item['name']}[/b]",
-            markup=True,
-            halign='center',
-            font_size='18sp'
-        ))
-        
-        code_label = Label(
-            text=str(item['code']),
-            font_size='56sp',
-            bold=True,
-            color=theme_manager.primary_color
-        )
-        content.add_widget(code_label)
-        
-        msg_label = Label(
-            text="Digite este código no campo de\nbusca do seu aplicativo Netflix.",
-            halign='center',
-            font_size='14sp',
-            color=[0.7, 0.7, 0.7, 1]
-        )
-        content.add_widget(msg_label)
-        
-        btn = Button(
-            text="FECHAR",
-            size_hint_y=None,
-            height=dp(60),
-            background_color=theme_manager.primary_color,
-            bold=True
-        )
-        content.add_widget(btn)
-        
-        popup = Popup(
-            title="Código da Categoria",
-            content=content,
-            size_hint=(0.85, 0.6),
-            auto_dismiss=True
-        )
-        btn.bind(on_release=popup.dismiss)
-        popup.open()
+from app.utils.perf import perf
 
 class RemoteControlApp(App):
     tv_ip = StringProperty("")
     tv_name = StringProperty("TV AOC")
     tv_port = 1925
+    tv_model = StringProperty("")
+    tv_state = StringProperty("")   # connected / degraded / lost (app.utils.health)
+    tv_status = StringProperty("")  # volume/mudo/fonte para o display (app.utils.tv_state)
     supported_keys = ListProperty([])
     netflix_categories = ListProperty([])
+    category_index = None
+    # Telas de controle na ordem em que são pré-montadas
+    REMOTE_SCREENS = ('remote_portrait', 'remote_landscape')
 
     def build(self):
         self.title = "Controle AOC Pro"
-        self.load_netflix_categories()
+        # Uma única thread envia os comandos, na ordem em que foram tocados
+        self.dispatcher = CommandDispatcher(
+            send_key=self._send_key,
+            send_text=lambda text: send_tv_text(self.tv_ip, self.tv_port, text)
+        )
+        self.dispatcher.start()
+        self.monitor = ConnectionMonitor(on_state=self._on_connection_state, on_moved=self._on_tv_moved)
+        self.tv_state_model = TvStateModel(
+            on_change=lambda state: Clock.schedule_once(lambda dt: setattr(self, 'tv_status', status_text(state)), 0)
+        )
+        self._catalog_lock = threading.Lock()
+        Clock.schedule_once(self._preload_categories, 0.5)
+        # Só a tela de busca entra antes do primeiro frame; as de controle são
+        # montadas depois, uma por frame (ou na hora, se o usuário chegar antes)
         self.sm = ScreenManager(transition=FadeTransition())
         self.sm.add_widget(ScanScreen())
-        self.sm.add_widget(RemotePortraitScreen())
-        self.sm.add_widget(RemoteLandscapeScreen())
+        self._prewarm = list(self.REMOTE_SCREENS)
+        Clock.schedule_once(self._prewarm_next, 0.3)
         Window.bind(on_size=self._on_resize)
+        Window.bind(on_keyboard=self._on_keyboard)
+        self.perf_overlay = None
         return self.sm
 
-    def load_netflix_categories(self):
-        json_path = 'assets/netflix_codes_full.json'
-        if not os.path.exists(json_path):
-            json_path = '/home/ubuntu/ControleAOC_New/assets/netflix_codes_full.json'
-            
-        try:
-            if os.path.exists(json_path):
-                with open(json_path, mode='r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.netflix_categories = [
-                        {'name': f"{item.get('category', '')} - {item.get('subcategory', '')}", 'code': item.get('code', '')}
-                        for item in data
-                    ]
+    def remote_screen(self, name):
+        """A tela de controle `name`, criada e montada na primeira vez que é pedida."""
+        if not self.sm.has_screen(name):
+            if name == 'remote_portrait':
+                from app.screens.remote_portrait import RemotePortraitScreen as screen_class
             else:
-                print("Arquivo JSON não encontrado.")
-        except Exception as e:
-            print(f"Erro ao carregar categorias: {e}")
-            self.netflix_categories = []
+                from app.screens.remote_landscape import RemoteLandscapeScreen as screen_class
+            self.sm.add_widget(screen_class())
+        screen = self.sm.get_screen(name)
+        screen.ensure_built()
+        return screen
+
+    def _prewarm_next(self, dt):
+        # Um passo por frame, para a tela de busca não travar enquanto isso
+        if self._prewarm:
+            self.remote_screen(self._prewarm.pop(0))
+            Clock.schedule_once(self._prewarm_next, 0)
+
+    def _show_remote(self, landscape):
+        self.sm.current = self.remote_screen('remote_landscape' if landscape else 'remote_portrait').name
+
+    def _preload_categories(self, dt):
+        # Depois do primeiro frame, carrega o catálogo em segundo plano
+        threading.Thread(target=self.load_netflix_categories, daemon=True).start()
+
+    def load_netflix_categories(self):
+        # Chamado pela pré-carga ou ao abrir a busca, o que vier primeiro
+        with self._catalog_lock:
+            if self.category_index is None:
+                try:
+                    from app.utils.catalog import load_catalog
+                    with perf.timer("catalog.load"):
+                        self.category_index = load_catalog()
+                except Exception as e:
+                    print(f"Erro ao carregar categorias: {e}")
+                if self.category_index is None:
+                    print("Arquivo de categorias não encontrado.")
+                else:
+                    items = self.category_index.items
+                    Clock.schedule_once(lambda dt: setattr(self, 'netflix_categories', items), 0)
+            return self.category_index
 
     def _on_resize(self, window, width, height):
         if self.sm.current == 'scan_screen': return
-        self.sm.current = 'remote_landscape' if width > height else 'remote_portrait'
+        self._show_remote(width > height)
+
+    def on_start(self):
+        if perf.enabled:  # AOC_PERF=1
+            self.toggle_perf_overlay(True)
+
+    def _on_keyboard(self, window, key, *args):
+        if key == 293:  # F12
+            self.toggle_perf_overlay()
+            return True
+
+    def toggle_perf_overlay(self, show=None):
+        # Liga a instrumentação junto com o painel; desligada, custa quase nada
+        from app.widgets.perf_overlay import PerfOverlay
+        show = self.perf_overlay is None if show is None else show
+        if show and self.perf_overlay is None:
+            perf.enabled = True
+            self.perf_overlay = PerfOverlay()
+            self.perf_overlay.show(Window)
+        elif not show and self.perf_overlay is not None:
+            perf.enabled = False
+            self.perf_overlay.hide()
+            self.perf_overlay = None
+
+    def on_stop(self):
+        self.monitor.stop()
+        self.tv_state_model.stop()
+        self.dispatcher.stop()
+        connection_manager.close_all()
+        tv_registry.flush()
 
     def go_to_scan(self):
         self.sm.current = 'scan_screen'
 
     def connect_to_tv(self, ip):
         self.tv_ip = ip
+        self.tv_model = ""
+        self.tv_state = ""
+        self.tv_status = ""
+        self.supported_keys = []
+        self.monitor.stop()
+        self.tv_state_model.stop()
         custom = get_custom_name(ip)
         self.tv_name = custom if custom else "TV AOC"
         threading.Thread(target=self._test_connection, daemon=True).start()
 
     def _test_connection(self):
         try:
-            url = f"http://{self.tv_ip}:{self.tv_port}/1/system"
-            res = requests.get(url, timeout=2)
+            # Usa o gerenciador de conexões para já deixar o keep-alive aquecido
+            res = connection_manager.get(self.tv_ip, self.tv_port, "/1/system")
             if res.status_code == 200:
                 if not get_custom_name(self.tv_ip):
                     try: self.tv_name = res.json().get('name', "TV AOC")
                     except: pass
                 Clock.schedule_once(lambda dt: self._switch_to_remote(), 0)
+                self._on_connected(res)
             else: self._show_error(f"Erro {res.status_code}")
         except: self._show_error("Falha na conexão")
 
+    def _on_connected(self, res):
+        # Na thread da conexão: registro, monitor de conexão e capacidades do
+        # modelo (sondadas só na primeira vez com o modelo/firmware)
+        try:
+            system = res.json()
+        except ValueError:
+            system = {}
+        self.monitor.start(self.tv_ip, self.tv_port, system.get('serialnumber'))
+        if not system:
+            return
+        return self._attach(self.tv_ip, system)
+
+    def _attach(self, ip, system):
+        # Registro, capacidades e estado da TV em `ip` (conexão nova ou TV
+        # que mudou de IP); roda numa thread de trabalho
+        model = system.get('model') or ip
+        tv_registry.mark_seen(ip, self.tv_port, model, system.get('serialnumber'))
+        caps = tv_capabilities.probe(ip, self.tv_port, system)
+        self.tv_state_model.start(ip, self.tv_port, caps.get('endpoints'))
+        keys = tv_capabilities.supported_keys(model)
+        def apply(dt):
+            self.tv_model = model
+            self.supported_keys = keys
+        Clock.schedule_once(apply, 0)
+        return caps
+
+    def _send_key(self, cmd):
+        # Roda na thread do dispatcher
+        model = self.tv_model
+        status = tv_capabilities.send_key(self.tv_ip, self.tv_port, cmd, model)
+        if status == BLOCKED:
+            return False   # nada foi à rede: não diz nada sobre a conexão
+        self.monitor.report(status is not None)
+        if status in KEY_REJECTED_STATUS and model:
+            keys = tv_capabilities.supported_keys(model)
+            Clock.schedule_once(lambda dt: setattr(self, 'supported_keys', keys), 0)
+        return status == 200
+
+    def _on_connection_state(self, state):
+        # Na thread do monitor
+        self.tv_state_model.set_reachable(state == CONNECTED)
+        Clock.schedule_once(lambda dt: setattr(self, 'tv_state', state), 0)
+
+    def _on_tv_moved(self, ip):
+        # Na thread do monitor, que achou a TV (mesmo número de série) em
+        # outro IP: o estado passa a ser lido de lá e o registro/capacidades
+        # são refeitos com o /1/system do IP novo
+        self.tv_state_model.stop()
+        Clock.schedule_once(lambda dt: setattr(self, 'tv_ip', ip), 0)
+        try:
+            system = connection_manager.get(ip, self.tv_port, "/1/system").json()
+        except (TransportError, ValueError):
+            system = {}
+        if not isinstance(system, dict) or not system:
+            system = {'model': self.tv_model or None, 'serialnumber': self.monitor.serial}
+        self._attach(ip, system)
+
     def _switch_to_remote(self):
-        self.sm.current = 'remote_landscape' if Window.width > Window.height else 'remote_portrait'
+        self._show_remote(Window.width > Window.height)
 
     def _show_error(self, msg):
         Clock.schedule_once(lambda dt: Popup(title="Erro", content=Label(text=msg), size_hint=(0.8, 0.3)).open(), 0)
@@ -218,18 +241,46 @@ class RemoteControlApp(App):
         popup.open()
 
     def show_netflix_search(self):
-        if not self.netflix_categories:
-            self.load_netflix_categories()
-        if self.netflix_categories:
-            NetflixSearchPopup(self.netflix_categories).open()
+        index = self.load_netflix_categories()
+        if index:
+            from app.widgets.netflix_search import NetflixSearchPopup
+            NetflixSearchPopup(index).open()
         else:
             self._show_error("Lista de categorias não encontrada.")
 
     def send_command(self, cmd):
-        threading.Thread(target=send_tv_command, args=(self.tv_ip, self.tv_port, cmd), daemon=True).start()
+        if self.supported_keys and cmd not in self.supported_keys:
+            return False
+        if not self.dispatcher.submit_key(cmd):
+            return False
+        self.tv_state_model.apply_key(cmd)  # o display muda já, sem esperar a TV
+        return True
+
+    def send_repeat(self, cmd):
+        # Repetição de botão segurado: descartada se a TV ainda não deu conta das anteriores
+        if self.supported_keys and cmd not in self.supported_keys:
+            return False
+        if not self.dispatcher.submit_repeat(cmd):
+            return False
+        self.tv_state_model.apply_key(cmd)
+        return True
+
+    def send_text(self, text, on_progress=None):
+        # Devolve o TextEntry (progresso/cancelamento) ou None se a fila recusou
+        entry = TextEntry(text, on_progress)
+        return entry if self.dispatcher.submit_text(entry) else None
+
+    def save_macro(self, name, steps):
+        # steps: "Home, CursorDown*3, Confirm" ou lista de passos
+        return macro_store.save(name, steps)
 
-    def send_text(self, text):
-        threading.Thread(target=send_tv_text, args=(self.tv_ip, self.tv_port, text), daemon=True).start()
+    def run_macro(self, name, on_step=None):
+        # Devolve o MacroRun (rastro/cancelamento) ou None se não existe ou a fila recusou
+        steps = macro_store.get(name)
+        if steps is None:
+            return None
+        run = MacroRun(name, steps, on_step)
+        return run if self.dispatcher.submit_macro(run) else None
 
 if __name__ == '__main__':
     RemoteControlApp().run()
@@ -0,0 +1,46 @@
+"""Teclas recusadas pela TV e o cache de capacidades por modelo."""
+import os
+from types import SimpleNamespace
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from app.utils import capabilities
+from app.utils.capabilities import BLOCKED, TvCapabilities
+from app.utils.registry import TvRegistry
+from main import RemoteControlApp
+
+MODEL = "FAKE-43PFG"
+
+def _caps(tmp_path, monkeypatch, status):
+    monkeypatch.setattr(capabilities, "post_tv_key", lambda ip, port, key: status)
+    return TvCapabilities(registry=TvRegistry(str(tmp_path / "tv_data.json")))
+
+def test_400_marks_key_unsupported(tmp_path, monkeypatch):
+    caps = _caps(tmp_path, monkeypatch, 400)
+    assert caps.send_key("127.0.0.1", 1925, "Teletext", MODEL) == 400
+    assert not caps.is_supported(MODEL, "Teletext")
+    assert "Teletext" not in caps.supported_keys(MODEL)
+
+def test_404_does_not_mark_key_unsupported(tmp_path, monkeypatch):
+    # 404 é o endpoint ou a versão da API, não a tecla
+    caps = _caps(tmp_path, monkeypatch, 404)
+    assert caps.send_key("127.0.0.1", 1925, "VolumeUp", MODEL) == 404
+    assert caps.is_supported(MODEL, "VolumeUp")
+    assert "VolumeUp" in caps.supported_keys(MODEL)
+
+def test_blocked_key_is_not_a_network_failure(tmp_path, monkeypatch):
+    caps = _caps(tmp_path, monkeypatch, 400)
+    caps.send_key("127.0.0.1", 1925, "Teletext", MODEL)
+    monkeypatch.setattr(capabilities, "post_tv_key", lambda ip, port, key: 1 / 0)
+    assert caps.send_key("127.0.0.1", 1925, "Teletext", MODEL) == BLOCKED
+
+def test_app_does_not_report_blocked_key_to_monitor(tmp_path, monkeypatch):
+    caps = _caps(tmp_path, monkeypatch, 400)
+    caps.send_key("127.0.0.1", 1925, "Teletext", MODEL)
+    monkeypatch.setattr("main.tv_capabilities", caps)
+    reports = []
+    app = RemoteControlApp(tv_ip="127.0.0.1", tv_model=MODEL)
+    app.monitor = SimpleNamespace(report=reports.append)
+    assert app._send_key("Teletext") is False
+    assert reports == []
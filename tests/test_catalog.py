@@ -0,0 +1,51 @@
+"""Catálogo de categorias compilado (app.utils.catalog)."""
+import json
+import os
+import pickle
+import zlib
+
+from app.utils import catalog
+from app.utils.catalog import compile_catalog, load_compiled, load_source, MAGIC, FORMAT_VERSION, SOURCE_JSON
+from app.utils.search import CategoryIndex
+
+QUERIES = ["acao", "terror sus", "thriler", "com", "documentarios", ""]
+
+def test_compiled_catalog_searches_like_the_source(tmp_path):
+    path = str(tmp_path / "categorias.bin")
+    built = compile_catalog(SOURCE_JSON, path)
+    loaded = load_compiled(path)
+    assert loaded is not None
+    assert loaded.items == load_source(SOURCE_JSON)
+    for query in QUERIES:
+        assert loaded.search(query) == built.search(query), query
+    assert os.path.getsize(path) < os.path.getsize(SOURCE_JSON)
+
+def _write(path, payload, version=FORMAT_VERSION):
+    with open(path, 'wb') as f:
+        f.write(MAGIC + bytes([version]) + payload)
+
+def test_other_versions_and_garbage_are_rejected(tmp_path):
+    path = str(tmp_path / "categorias.bin")
+    data = CategoryIndex(load_source(SOURCE_JSON)).to_data()
+    compressed = zlib.compress(json.dumps(data).encode('utf-8'))
+
+    _write(path, compressed, version=FORMAT_VERSION - 1)
+    assert load_compiled(path) is None
+
+    stale = dict(data, version=CategoryIndex.DATA_VERSION + 1)
+    _write(path, zlib.compress(json.dumps(stale).encode('utf-8')))
+    assert load_compiled(path) is None
+
+    # Um catálogo antigo (objeto serializado) não é carregado
+    _write(path, pickle.dumps(CategoryIndex([{'name': 'a', 'code': '1'}])))
+    assert load_compiled(path) is None
+
+    _write(path, compressed[:len(compressed) // 2])
+    assert load_compiled(path) is None
+
+    assert load_compiled(str(tmp_path / "nao_existe.bin")) is None
+
+def test_load_catalog_falls_back_to_source(monkeypatch):
+    monkeypatch.setattr(catalog, "load_compiled", lambda: None)
+    index = catalog.load_catalog()
+    assert index is not None and len(index) == len(load_source(SOURCE_JSON))
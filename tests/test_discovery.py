@@ -0,0 +1,102 @@
+"""Descoberta interrompida pelo consumidor (TVs falsas em 127.0.12.0/24)."""
+import asyncio
+import threading
+
+from app.utils import discovery
+from app.utils.discovery import (
+    PRIORITY_KNOWN, PRIORITY_NEIGHBOR, PRIORITY_VENDOR, find_tv, iter_discovery_events, neighbor_priorities,
+)
+from app.utils.network import scan_hosts
+from app.utils.registry import tv_registry
+from benchmarks.common import use_temp_registry
+from benchmarks.fake_tv import FakeTvProcess
+
+PREFIX = "127.0.12."
+TVS = [f"{PREFIX}{i}" for i in (7, 42, 120, 200)]
+TV = TVS[-1]
+
+def _run_with_limit(target, limit):
+    """Roda `target` numa thread e devolve (terminou, resultado)."""
+    result = []
+    thread = threading.Thread(target=lambda: result.append(target()), daemon=True)
+    thread.start()
+    thread.join(limit)
+    return not thread.is_alive(), result[0] if result else None
+
+def test_close_after_first_found_returns():
+    use_temp_registry()
+
+    def first_found():
+        # Poucos workers, hosts vazios que recusam na hora e outras TVs
+        # respondendo: há verificações terminando junto com o cancelamento
+        events = iter_discovery_events(
+            interfaces=[("lo", f"{PREFIX}1", "255.255.255.0")], hints=[TV], announcements=False,
+            neighbors={}, concurrency=4
+        )
+        for event in events:
+            if event.kind == 'found':
+                events.close()
+                return event.ip
+        return None
+
+    with FakeTvProcess(TVS):
+        # Uma busca completa antes, como ao buscar de novo no app
+        scan_hosts([f"{PREFIX}{i}" for i in range(1, 255)], on_found=lambda ip, name: None)
+        for _ in range(5):
+            finished, result = _run_with_limit(first_found, 10)
+            assert finished, "fechar a descoberta depois da primeira TV não retornou"
+            assert result == TV
+
+def test_find_tv_returns_with_probes_pending(monkeypatch):
+    use_temp_registry()
+    moved = f"{PREFIX}210"
+    serial = "FK" + moved.replace(".", "")
+    # A TV mudou de .5 para .210; o registro tem outros 40 IPs
+    tv_registry.mark_seen(f"{PREFIX}5", 1925, "FAKE-43PFG", serial)
+    for i in range(10, 50):
+        tv_registry.mark_seen(f"{PREFIX}{i}", 1925)
+    tv_registry.mark_seen(moved, 1925)
+
+    async def check_tv(ip, *args):
+        if ip == moved:
+            tv_registry.mark_seen(ip, serial=serial)
+            return "TV"
+        # Verificação lenta que engole o cancelamento, como o wait_for do
+        # Python 3.11 quando o cancel() chega junto com o fim da operação
+        try:
+            await asyncio.sleep(0.5)
+        except asyncio.CancelledError:
+            pass
+        return None
+
+    monkeypatch.setattr(discovery, "async_check_tv", check_tv)
+    finished, result = _run_with_limit(lambda: find_tv(serial, exclude=(f"{PREFIX}5",), listen_time=0.1), 10)
+    assert finished, "find_tv não retornou com verificações pendentes"
+    assert result == moved
+
+def test_vendor_ouis_without_known_tvs():
+    # Primeira busca: nenhuma TV no registro, só os OUIs de fornecedores
+    neighbors = {
+        "192.168.0.20": "70:af:24:12:34:56",   # TP Vision
+        "192.168.0.21": "00:e0:4c:ab:cd:ef",   # Realtek
+        "192.168.0.30": "3c:22:fb:00:00:01",   # outro fabricante
+    }
+    assert neighbor_priorities(neighbors, macs={}) == {
+        "192.168.0.20": PRIORITY_VENDOR,
+        "192.168.0.21": PRIORITY_VENDOR,
+        "192.168.0.30": PRIORITY_NEIGHBOR,
+    }
+    # Sem sub-redes para varrer, só os candidatos a TV são verificados
+    assert set(neighbor_priorities(neighbors, macs={}, sweep=False)) == {"192.168.0.20", "192.168.0.21"}
+
+def test_learned_ouis_are_merged_with_vendor_ouis():
+    neighbors = {
+        "192.168.0.20": "70:af:24:12:34:56",
+        "192.168.0.40": "a4:5e:60:00:00:02",   # mesmo OUI da TV já vista
+        "192.168.0.41": "a4:5e:60:00:00:01",   # a própria TV já vista
+    }
+    assert neighbor_priorities(neighbors, macs={"a4:5e:60:00:00:01": "192.168.0.9"}, sweep=False) == {
+        "192.168.0.20": PRIORITY_VENDOR,
+        "192.168.0.40": PRIORITY_VENDOR,
+        "192.168.0.41": PRIORITY_KNOWN,
+    }
@@ -0,0 +1,130 @@
+"""CommandDispatcher sem Kivy e sem TV: `send_key` falso que registra as teclas."""
+import threading
+import time
+
+from app.utils.dispatcher import CommandDispatcher
+from app.utils.network import TextEntry
+
+class FakeTv:
+    """Registra o que chega; a primeira tecla fica presa até `release()`."""
+
+    def __init__(self):
+        self.sent = []
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def send_key(self, key):
+        self.started.set()
+        self.gate.wait(5)
+        self.sent.append(key)
+        return True
+
+    def send_text(self, text):
+        self.sent.append(("text", text))
+        return True
+
+    def release(self):
+        self.gate.set()
+
+def _dispatcher(tv, **kwargs):
+    dispatcher = CommandDispatcher(send_key=tv.send_key, send_text=tv.send_text, **kwargs)
+    dispatcher.start()
+    return dispatcher
+
+def _busy(tv, dispatcher):
+    # Deixa a TV ocupada com uma tecla, para as próximas ficarem na fila
+    dispatcher.submit_key("Home")
+    assert tv.started.wait(5)
+
+def _drain(tv, dispatcher, count):
+    tv.release()
+    deadline = time.monotonic() + 5
+    while dispatcher.stats()["sent"] < count and time.monotonic() < deadline:
+        time.sleep(0.005)
+    dispatcher.stop()
+
+def test_keys_and_text_go_out_in_order():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv, coalesce_window=0)
+    _busy(tv, dispatcher)
+    for key in ("CursorDown", "Confirm", "CursorDown"):
+        assert dispatcher.submit_key(key)
+    assert dispatcher.submit_text("abc")
+    assert dispatcher.submit_key("Back")
+    _drain(tv, dispatcher, 6)
+    assert tv.sent == ["Home", "CursorDown", "Confirm", "CursorDown", ("text", "abc"), "Back"]
+
+def test_repeats_within_window_are_coalesced():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv, coalesce_window=1.0)
+    _busy(tv, dispatcher)
+    for _ in range(3):
+        assert dispatcher.submit_key("VolumeUp")
+    assert dispatcher.submit_key("Mute")
+    assert dispatcher.submit_key("Mute")          # Mute não é repetível
+    assert len(dispatcher._queue) == 3
+    assert dispatcher.depth == 5
+    _drain(tv, dispatcher, 6)
+    assert tv.sent == ["Home", "VolumeUp", "VolumeUp", "VolumeUp", "Mute", "Mute"]
+    assert dispatcher.stats()["coalesced"] == 2
+
+def test_repeats_outside_window_are_not_coalesced():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv, coalesce_window=0.01)
+    _busy(tv, dispatcher)
+    dispatcher.submit_key("VolumeUp")
+    time.sleep(0.05)
+    dispatcher.submit_key("VolumeUp")
+    assert len(dispatcher._queue) == 2
+    _drain(tv, dispatcher, 3)
+    assert dispatcher.stats()["coalesced"] == 0
+
+def test_full_queue_drops_oldest_repeatable():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv, max_queue=3, coalesce_window=0)
+    _busy(tv, dispatcher)
+    for key in ("VolumeUp", "Confirm", "CursorDown"):
+        assert dispatcher.submit_key(key)
+    assert dispatcher.submit_key("Back")          # sai o VolumeUp, o repetível mais antigo
+    assert dispatcher.submit_key("Info")          # sai o CursorDown
+    assert not dispatcher.submit_key("Menu")      # só sobrou o que não pode ser perdido
+    _drain(tv, dispatcher, 4)
+    assert tv.sent == ["Home", "Confirm", "Back", "Info"]
+    assert dispatcher.stats()["dropped"] == 3
+
+def test_stale_repeats_are_skipped():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv, stale_after=0.05)
+    _busy(tv, dispatcher)
+    dispatcher.submit_key("ChannelUp")
+    dispatcher.submit_key("Confirm")
+    time.sleep(0.1)
+    _drain(tv, dispatcher, 2)
+    assert tv.sent == ["Home", "Confirm"]
+    assert dispatcher.stats()["dropped"] == 1
+
+def test_submit_repeat_is_throttled_while_tv_is_busy():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv)
+    dispatcher.submit_repeat("VolumeUp")
+    assert tv.started.wait(5)
+    assert dispatcher.submit_repeat("VolumeUp")       # 1 em andamento + 1 na fila
+    assert not dispatcher.submit_repeat("VolumeUp")   # chegou em max_pending
+    assert dispatcher.stats()["throttled"] == 1
+    _drain(tv, dispatcher, 2)
+    assert tv.sent == ["VolumeUp", "VolumeUp"]
+
+def test_stop_finishes_queued_text_and_refuses_new_work():
+    tv = FakeTv()
+    dispatcher = _dispatcher(tv)
+    _busy(tv, dispatcher)
+    entry = TextEntry("192.168.0.42")
+    assert dispatcher.submit_text(entry)
+    try:
+        dispatcher.stop(timeout=0.05)
+        assert entry.finished.is_set()
+        assert entry.cancelled and entry.ok is False
+        assert not dispatcher.submit_key("Home")
+        assert not dispatcher.submit_text(TextEntry("1"))
+    finally:
+        tv.release()
@@ -0,0 +1,48 @@
+"""TvRegistry: leitura de arquivos antigos ou estragados e gravação fora do lock."""
+import json
+import os
+import threading
+
+import pytest
+
+from app.utils import registry
+from app.utils.registry import TvRegistry
+
+@pytest.mark.parametrize("content", [["192.168.0.10"], "TV da sala", 42, None])
+def test_unexpected_json_loads_empty(tmp_path, content):
+    path = tmp_path / "tv_data.json"
+    path.write_text(json.dumps(content), encoding='utf-8')
+    assert TvRegistry(str(path)).all() == {}
+
+def test_legacy_name_map_is_migrated(tmp_path):
+    path = tmp_path / "tv_data.json"
+    path.write_text(json.dumps({"192.168.0.10": "Sala", "192.168.0.11": 3}), encoding='utf-8')
+    assert TvRegistry(str(path)).all() == {"192.168.0.10": {"name": "Sala"}}
+
+def test_flush_writes_without_holding_the_lock(tmp_path, monkeypatch):
+    tvs = TvRegistry(str(tmp_path / "tv_data.json"))
+    tvs.set_name("192.168.0.10", "Sala")
+    writing, release = threading.Event(), threading.Event()
+    replace = os.replace
+
+    def slow_replace(src, dst):
+        writing.set()
+        release.wait(5)
+        replace(src, dst)
+
+    monkeypatch.setattr(registry.os, "replace", slow_replace)
+    flusher = threading.Thread(target=tvs.flush)
+    flusher.start()
+    try:
+        assert writing.wait(5)
+        # Com o disco "lento", leituras e alterações não esperam a gravação
+        reader = threading.Thread(target=lambda: (tvs.get("192.168.0.10"), tvs.mark_seen("192.168.0.11")))
+        reader.start()
+        reader.join(1)
+        assert not reader.is_alive(), "get/mark_seen esperaram a gravação em disco"
+    finally:
+        release.set()
+        flusher.join(5)
+    monkeypatch.setattr(registry.os, "replace", replace)
+    tvs.flush()
+    assert TvRegistry(tvs.path).all().keys() == {"192.168.0.10", "192.168.0.11"}
@@ -0,0 +1,77 @@
+"""Varredura como fluxo de eventos (TVs falsas em 127.0.14.0/24)."""
+import asyncio
+import threading
+import time
+
+from app.utils import network
+from app.utils.network import iter_scan_events
+from benchmarks.common import use_temp_registry
+from benchmarks.fake_tv import FakeTvConfig, FakeTvProcess
+
+PREFIX = "127.0.14."
+TVS = [f"{PREFIX}{i}" for i in (20, 21)]
+SLOW_TVS = [f"{PREFIX}{i}" for i in range(30, 36)]
+EMPTY = [f"{PREFIX}{i}" for i in range(40, 46)]   # ninguém escutando
+
+def _track_probes(monkeypatch):
+    """Envolve async_check_tv para saber quais verificações foram canceladas."""
+    started, cancelled = set(), set()
+    check_tv = network.async_check_tv
+
+    async def tracked(ip, *args):
+        started.add(ip)
+        try:
+            return await check_tv(ip, *args)
+        except asyncio.CancelledError:
+            cancelled.add(ip)
+            raise
+
+    monkeypatch.setattr(network, "async_check_tv", tracked)
+    return started, cancelled
+
+def test_events_found_progress_done():
+    use_temp_registry()
+    hosts = TVS + EMPTY
+    with FakeTvProcess(TVS):
+        events = list(iter_scan_events(hosts))
+    found = {e.ip: e.name for e in events if e.kind == 'found'}
+    assert found == {ip: f"Fake TV {ip}" for ip in TVS}
+    progress = [e for e in events if e.kind == 'progress']
+    assert sorted(e.ip for e in progress) == sorted(hosts)
+    assert [e.done for e in progress] == list(range(1, len(hosts) + 1))
+    assert events[-1].kind == 'done'
+    assert (events[-1].done, events[-1].total) == (len(hosts), len(hosts))
+    assert sum(e.kind == 'done' for e in events) == 1
+
+def test_close_cancels_probes_in_flight(monkeypatch):
+    use_temp_registry()
+    started, cancelled = _track_probes(monkeypatch)
+    with FakeTvProcess(TVS), FakeTvProcess(SLOW_TVS, FakeTvConfig(latency=5.0)):
+        events = iter_scan_events(TVS + SLOW_TVS, probe_timeout=10, timeout=10)
+        first = next(e for e in events if e.kind == 'found')
+        begin = time.monotonic()
+        events.close()
+        elapsed = time.monotonic() - begin
+    assert first.ip in TVS
+    assert elapsed < 1.0, f"close() esperou as TVs lentas ({elapsed:.2f} s)"
+    assert set(SLOW_TVS) <= started
+    assert cancelled == set(SLOW_TVS)
+
+def test_close_from_another_thread_stops_waiting(monkeypatch):
+    # Como a tela de busca: a thread da busca espera o próximo evento e a
+    # interface fecha a busca sem esperar esse evento chegar
+    use_temp_registry()
+    started, cancelled = _track_probes(monkeypatch)
+    received = []
+    with FakeTvProcess(SLOW_TVS, FakeTvConfig(latency=5.0)):
+        events = iter_scan_events(SLOW_TVS, probe_timeout=10, timeout=10)
+        thread = threading.Thread(target=lambda: received.extend(events), daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while len(started) < len(SLOW_TVS) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        events.close()
+        thread.join(2)
+        assert not thread.is_alive(), "a thread da busca continuou esperando"
+    assert received == []
+    assert cancelled == set(SLOW_TVS)
@@ -0,0 +1,43 @@
+"""Estado da TV quando o monitor a reencontra em outro IP (TVs falsas em 127.0.13.0/24)."""
+import os
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from app.utils.network import connection_manager
+from app.utils.registry import tv_registry
+from app.utils.tv_state import TvStateModel
+from benchmarks.common import use_temp_registry
+from benchmarks.fake_tv import FakeTvProcess, TV_PORT, tv_system_info
+from main import RemoteControlApp
+
+OLD_IP = "127.0.13.10"
+NEW_IP = "127.0.13.20"
+
+def _requests(ip):
+    # Conta também o próprio GET /fake/stats
+    return connection_manager.get(ip, TV_PORT, "/fake/stats").json()["requests"]
+
+def test_state_model_follows_moved_tv():
+    use_temp_registry()
+    app = RemoteControlApp()
+    app.tv_state_model = TvStateModel(poll_interval=0.1, settle=0.05)
+    app.monitor = SimpleNamespace(serial=None)
+    with FakeTvProcess([OLD_IP, NEW_IP]):
+        app.tv_state_model.start(OLD_IP, TV_PORT)
+        try:
+            app._on_tv_moved(NEW_IP)
+            assert app.tv_state_model.ip == NEW_IP
+            entry = tv_registry.get(NEW_IP)
+            assert entry["serial"] == tv_system_info(NEW_IP)["serialnumber"]
+            assert entry["model"] == tv_system_info(NEW_IP)["model"]
+
+            old, new = _requests(OLD_IP), _requests(NEW_IP)
+            time.sleep(0.5)
+            assert _requests(OLD_IP) == old + 1, "o IP antigo continuou sendo consultado"
+            assert _requests(NEW_IP) > new + 1, "o IP novo não foi consultado"
+        finally:
+            app.tv_state_model.stop()
+            connection_manager.close_all()